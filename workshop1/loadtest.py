@@ -0,0 +1,71 @@
+"""Measures requests/sec of a running service.
+
+Start the service with different worker counts and compare, e.g.:
+
+    WEB_CONCURRENCY=1 python serve.py &   python loadtest.py
+    WEB_CONCURRENCY=4 python serve.py &   python loadtest.py
+
+Defaults to GET /list-apps, which goes through ADK's FastAPI app without
+calling a model.
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+
+async def _client(client, url: str, deadline: float, latencies, errors):
+    while time.monotonic() < deadline:
+        start = time.perf_counter()
+        try:
+            response = await client.get(url)
+            response.raise_for_status()
+            latencies.append(time.perf_counter() - start)
+        except httpx.HTTPError:
+            errors.append(1)
+
+
+async def run(url: str, connections: int, seconds: float, warmup: float) -> dict:
+    limits = httpx.Limits(max_connections=connections)
+    async with httpx.AsyncClient(limits=limits, timeout=30) as client:
+        if warmup:
+            await asyncio.gather(
+                *(
+                    _client(client, url, time.monotonic() + warmup, [], [])
+                    for _ in range(connections)
+                )
+            )
+        latencies, errors = [], []
+        deadline = time.monotonic() + seconds
+        await asyncio.gather(
+            *(
+                _client(client, url, deadline, latencies, errors)
+                for _ in range(connections)
+            )
+        )
+    latencies.sort()
+    return {
+        "requests_per_sec": len(latencies) / seconds,
+        "errors": len(errors),
+        "p50_ms": 1000 * statistics.median(latencies) if latencies else 0.0,
+        "p99_ms": (
+            1000 * latencies[int(0.99 * (len(latencies) - 1))] if latencies else 0.0
+        ),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="http://localhost:8080/list-apps")
+    parser.add_argument("--connections", type=int, default=64)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--warmup", type=float, default=2)
+    args = parser.parse_args()
+    result = asyncio.run(run(args.url, args.connections, args.seconds, args.warmup))
+    print(
+        f"{result['requests_per_sec']:.0f} req/s, {result['errors']} errors,"
+        f" p50 {result['p50_ms']:.1f} ms, p99 {result['p99_ms']:.1f} ms"
+    )
@@ -1,9 +1,11 @@
 import os
 
-import uvicorn
 from fastapi import FastAPI
 from google.adk.cli.fast_api import get_fast_api_app
 
+from serve import serve
+from session_db import schema_lock, session_db_kwargs, session_db_lifespan
+
 # Get the directory where main.py is located
 AGENT_DIR = os.path.dirname(os.path.abspath(__file__))
 # Example session service URI (e.g., SQLite)
@@ -15,12 +17,15 @@ SERVE_WEB_INTERFACE = True
 
 # Call the function to get the FastAPI app instance
 # Ensure the agent directory name ('capital_agent') matches your agent folder
-app: FastAPI = get_fast_api_app(
-    agents_dir=AGENT_DIR,
-    session_service_uri=SESSION_SERVICE_URI,
-    allow_origins=ALLOWED_ORIGINS,
-    web=SERVE_WEB_INTERFACE,
-)
+with schema_lock(SESSION_SERVICE_URI):
+    app: FastAPI = get_fast_api_app(
+        agents_dir=AGENT_DIR,
+        session_service_uri=SESSION_SERVICE_URI,
+        session_db_kwargs=session_db_kwargs(SESSION_SERVICE_URI),
+        allow_origins=ALLOWED_ORIGINS,
+        web=SERVE_WEB_INTERFACE,
+        lifespan=session_db_lifespan(SESSION_SERVICE_URI),
+    )
 
 # You can add more FastAPI routes or configurations below if needed
 # Example:
@@ -29,5 +34,6 @@ async def read_root():
     return {"Hello": "World"}
 
 if __name__ == "__main__":
-    # Use the PORT environment variable provided by Cloud Run, defaulting to 8080
-    uvicorn.run(app, host="0.0.0.0", port=int(os.environ.get("PORT", 8080)))
+    # Prefer `python serve.py`: this process has already built the app, and
+    # with more than one worker each worker builds its own.
+    serve("main:app")
@@ -3,23 +3,52 @@ import datetime
 from zoneinfo import ZoneInfo
 from google.adk.agents import Agent
 
-def get_news(city: str) -> dict:
-   """Retrieves the news of a particular city.
+from .news_store import open_store
+
+news_store = open_store()
+
+def get_news(
+   city: str,
+   start_date: str = "",
+   end_date: str = "",
+   query: str = "",
+   page_size: int = 5,
+   page_token: str = "",
+) -> dict:
+   """Retrieves the news of a particular city, newest first.
    Args:
        city (str): The name of the city for which to retrieve the news.
+       start_date (str): Optional earliest publication date, as YYYY-MM-DD.
+       end_date (str): Optional latest publication date, as YYYY-MM-DD.
+       query (str): Optional keywords that the headline or content must contain.
+       page_size (int): Number of articles to return.
+       page_token (str): The next_page_token of a previous call, to get more articles.
 
    Returns:
-       dict: headline and content of the news, or error message.
+       dict: articles with headline, content and published date plus a
+       next_page_token when more are available, or error message.
    """
-   if city.lower() == "bengaluru" or city.lower() == "bangalore":
+   try:
+       articles, next_page_token = news_store.search(
+           city,
+           start_date=start_date,
+           end_date=end_date,
+           query=query,
+           page_size=max(1, min(page_size, 20)),
+           page_token=page_token,
+       )
+   except ValueError as e:
        return {
-           "headline": "Upto 6 hour long traffic Jams in Bengaluru on 9th September",
-           "content": "Due to extremely heavy rainfall, parts of Bengaluru, including Whitefield and MG Road experienced long traffic jams due to waterlogging.",
+           "error_message": f"Invalid request: {e}",
        }
-   else:
+   if not articles:
        return {
            "error_message": f"News for '{city}' is not available.",
        }
+   return {
+       "articles": articles,
+       "next_page_token": next_page_token,
+   }
 
 root_agent = Agent(
    name="news_assistant_agent",
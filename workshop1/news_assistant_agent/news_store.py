@@ -0,0 +1,248 @@
+import argparse
+import datetime
+import fcntl
+import json
+import os
+import re
+import sqlite3
+import threading
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+SEED_PATH = os.path.join(DATA_DIR, "news.jsonl")
+# Kept in the user's data dir rather than next to the package sources, so
+# articles loaded with `python news_store.py` survive reboots and redeploys.
+DEFAULT_DB_PATH = os.path.join(
+    os.getenv("XDG_DATA_HOME") or os.path.expanduser("~/.local/share"),
+    "news_assistant",
+    "news.db",
+)
+
+# Alternative city names, mapped to the name articles are stored under.
+DEFAULT_ALIASES = {
+    "bangalore": "bengaluru",
+    "bombay": "mumbai",
+    "madras": "chennai",
+    "calcutta": "kolkata",
+    "gurgaon": "gurugram",
+    "new delhi": "delhi",
+    "poona": "pune",
+    "mysore": "mysuru",
+}
+
+_WORD = re.compile(r"\w+")
+
+
+def _canonical(name: str) -> str:
+    return " ".join(name.lower().split())
+
+
+class NewsStore:
+    """Local news index backed by SQLite.
+
+    Articles are stored once and indexed by (city, published, id), so a city
+    lookup with a date range is a single index range scan that stops after
+    one page. Headlines and content are also indexed with FTS5 for keyword
+    search. Alternative city names resolve through an alias table.
+
+    Pages are returned newest first. Each page carries an opaque
+    `next_page_token` encoding the last (published, id) seen, so fetching
+    page N costs the same as page 1.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        with self._connection() as conn:
+            conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS articles (
+                    id INTEGER PRIMARY KEY,
+                    city TEXT NOT NULL,
+                    published TEXT NOT NULL,
+                    headline TEXT NOT NULL,
+                    content TEXT NOT NULL,
+                    url TEXT
+                );
+                CREATE INDEX IF NOT EXISTS articles_city_published
+                    ON articles (city, published DESC, id DESC);
+                CREATE TABLE IF NOT EXISTS city_aliases (
+                    alias TEXT PRIMARY KEY,
+                    city TEXT NOT NULL
+                ) WITHOUT ROWID;
+                CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+                    headline, content, content='articles', content_rowid='id'
+                );
+                """
+            )
+            conn.executemany(
+                "INSERT OR IGNORE INTO city_aliases (alias, city) VALUES (?, ?)",
+                DEFAULT_ALIASES.items(),
+            )
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA mmap_size=268435456")
+            conn.execute("PRAGMA cache_size=-65536")
+            self._local.conn = conn
+        return conn
+
+    def resolve_city(self, city: str) -> str:
+        city = _canonical(city)
+        row = self._connection().execute(
+            "SELECT city FROM city_aliases WHERE alias = ?", (city,)
+        ).fetchone()
+        return row["city"] if row else city
+
+    def add_aliases(self, aliases: dict[str, str]):
+        with self._connection() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO city_aliases (alias, city) VALUES (?, ?)",
+                [(_canonical(a), _canonical(c)) for a, c in aliases.items()],
+            )
+
+    def ingest(self, records, batch_size: int = 10000) -> int:
+        """Bulk-loads article dicts and returns how many were added.
+
+        Each record needs `city`, `published` (ISO date or datetime),
+        `headline` and `content`; `url` is optional. Rows are written in
+        batches and the full-text index is extended once per batch.
+        """
+        conn = self._connection()
+        added = 0
+        batch = []
+
+        def flush():
+            with conn:
+                start = conn.execute(
+                    "SELECT COALESCE(MAX(id), 0) FROM articles"
+                ).fetchone()[0]
+                conn.executemany(
+                    "INSERT INTO articles"
+                    " (city, published, headline, content, url)"
+                    " VALUES (?, ?, ?, ?, ?)",
+                    batch,
+                )
+                conn.execute(
+                    "INSERT INTO articles_fts (rowid, headline, content)"
+                    " SELECT id, headline, content FROM articles WHERE id > ?",
+                    (start,),
+                )
+
+        for record in records:
+            published = datetime.datetime.fromisoformat(record["published"])
+            batch.append(
+                (
+                    self.resolve_city(record["city"]),
+                    published.date().isoformat(),
+                    record["headline"],
+                    record["content"],
+                    record.get("url"),
+                )
+            )
+            if len(batch) >= batch_size:
+                flush()
+                added += len(batch)
+                batch = []
+        if batch:
+            flush()
+            added += len(batch)
+        return added
+
+    def ingest_jsonl(self, path: str, batch_size: int = 10000) -> int:
+        with open(path, encoding="utf-8") as f:
+            return self.ingest(
+                (json.loads(line) for line in f if line.strip()), batch_size
+            )
+
+    def is_empty(self) -> bool:
+        return self._connection().execute(
+            "SELECT 1 FROM articles LIMIT 1"
+        ).fetchone() is None
+
+    def search(
+        self,
+        city: str,
+        start_date: str = "",
+        end_date: str = "",
+        query: str = "",
+        page_size: int = 5,
+        page_token: str = "",
+    ) -> tuple[list[dict], str]:
+        """Returns one page of articles for a city and the next page token.
+
+        Dates are inclusive ISO dates. `query` keeps only articles whose
+        headline or content contains all of its words. The token is empty
+        on the last page.
+        """
+        where = ["a.city = ?"]
+        params = [self.resolve_city(city)]
+        if start_date:
+            where.append("a.published >= ?")
+            params.append(datetime.date.fromisoformat(start_date).isoformat())
+        if end_date:
+            where.append("a.published <= ?")
+            params.append(datetime.date.fromisoformat(end_date).isoformat())
+        if page_token:
+            published, last_id = page_token.rsplit(":", 1)
+            where.append("(a.published, a.id) < (?, ?)")
+            params.extend([published, int(last_id)])
+        source = "articles AS a"
+        words = _WORD.findall(query)
+        if words:
+            source = "articles_fts JOIN articles AS a ON a.id = articles_fts.rowid"
+            where.append("articles_fts MATCH ?")
+            params.append(" ".join(f'"{w}"' for w in words))
+        rows = self._connection().execute(
+            f"SELECT a.id, a.published, a.headline, a.content, a.url"
+            f" FROM {source} WHERE {' AND '.join(where)}"
+            f" ORDER BY a.published DESC, a.id DESC LIMIT ?",
+            (*params, page_size + 1),
+        ).fetchall()
+        articles = [
+            {
+                "headline": row["headline"],
+                "content": row["content"],
+                "published": row["published"],
+                **({"url": row["url"]} if row["url"] else {}),
+            }
+            for row in rows[:page_size]
+        ]
+        next_page_token = ""
+        if len(rows) > page_size:
+            last = rows[page_size - 1]
+            next_page_token = f"{last['published']}:{last['id']}"
+        return articles, next_page_token
+
+
+def open_store() -> NewsStore:
+    """Opens the store at NEWS_DB_PATH, seeding it from NEWS_SEED_PATH if empty."""
+    path = os.getenv("NEWS_DB_PATH", DEFAULT_DB_PATH)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    seed_path = os.getenv("NEWS_SEED_PATH", SEED_PATH)
+    # Every server worker opens the store at import; the lock makes sure
+    # only the first one seeds it.
+    with open(f"{path}.lock", "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        store = NewsStore(path)
+        if store.is_empty() and os.path.exists(seed_path):
+            store.ingest_jsonl(seed_path)
+    return store
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk-load news articles.")
+    parser.add_argument("paths", nargs="+", help="JSONL files to ingest")
+    parser.add_argument(
+        "--db", default=os.getenv("NEWS_DB_PATH", DEFAULT_DB_PATH)
+    )
+    parser.add_argument("--batch-size", type=int, default=10000)
+    args = parser.parse_args()
+    os.makedirs(os.path.dirname(os.path.abspath(args.db)), exist_ok=True)
+    store = NewsStore(args.db)
+    for path in args.paths:
+        print(f"{path}: {store.ingest_jsonl(path, args.batch_size)} articles")
@@ -0,0 +1,122 @@
+"""Concurrency benchmark for the SQLite session database.
+
+Each concurrent session runs in its own process with its own
+DatabaseSessionService, like separate uvicorn workers sharing one file. It
+appends events to its session and re-reads the session every 10 appends.
+
+    python session_benchmark.py --seconds 10
+    python session_benchmark.py --default   # ADK's stock engine settings
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import statistics
+import tempfile
+import time
+import uuid
+
+
+_start_barrier = None
+
+
+def _init_worker(barrier):
+    global _start_barrier
+    _start_barrier = barrier
+
+
+async def _run_session(uri: str, tuned: bool, seconds: float, index: int):
+    from google.adk.events import Event, EventActions
+    from google.adk.sessions import DatabaseSessionService
+    from google.genai import types
+    from sqlalchemy.exc import OperationalError
+
+    kwargs = {}
+    if tuned:
+        from session_db import session_db_kwargs
+
+        kwargs = session_db_kwargs(uri)
+    service = DatabaseSessionService(uri, **kwargs)
+    session = await service.create_session(app_name="bench", user_id=f"user{index}")
+    appends, errors, read_latencies = 0, 0, []
+    # Importing ADK is slow; start timing only once every worker is ready.
+    _start_barrier.wait()
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        event = Event(
+            invocation_id=str(uuid.uuid4()),
+            author="user",
+            content=types.Content(
+                role="user", parts=[types.Part(text=f"What is the news in city {appends}?")]
+            ),
+            actions=EventActions(state_delta={"turns": appends}),
+        )
+        try:
+            await service.append_event(session, event)
+            appends += 1
+        except OperationalError:
+            errors += 1
+        if appends % 10 == 0 or errors:
+            start = time.perf_counter()
+            session = await service.get_session(
+                app_name="bench", user_id=f"user{index}", session_id=session.id
+            )
+            read_latencies.append(time.perf_counter() - start)
+    return appends, errors, read_latencies
+
+
+def _worker(args):
+    return asyncio.run(_run_session(*args))
+
+
+def run(concurrency: int, tuned: bool, seconds: float) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        uri = f"sqlite:///{os.path.join(tmp, 'sessions.db')}"
+        # Create the schema, indexes and app state row once, before the
+        # workers race to.
+        from google.adk.sessions import DatabaseSessionService
+
+        asyncio.run(
+            DatabaseSessionService(uri).create_session(
+                app_name="bench", user_id="setup"
+            )
+        )
+        if tuned:
+            from session_db import ensure_indexes
+
+            ensure_indexes(os.path.join(tmp, "sessions.db"))
+        context = multiprocessing.get_context("spawn")
+        barrier = context.Barrier(concurrency)
+        with context.Pool(concurrency, _init_worker, (barrier,)) as pool:
+            results = pool.map(
+                _worker, [(uri, tuned, seconds, i) for i in range(concurrency)]
+            )
+    appends = sum(r[0] for r in results)
+    latencies = sorted(l for r in results for l in r[2])
+    return {
+        "appends_per_sec": appends / seconds,
+        "lock_errors": sum(r[1] for r in results),
+        "read_p50_ms": 1000 * statistics.median(latencies) if latencies else 0.0,
+        "read_p95_ms": (
+            1000 * latencies[int(0.95 * (len(latencies) - 1))] if latencies else 0.0
+        ),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument(
+        "--default", action="store_true", help="use ADK's default engine settings"
+    )
+    args = parser.parse_args()
+    print("sessions  appends/s  lock errors  read p50 ms  read p95 ms")
+    for concurrency in args.concurrency:
+        result = run(concurrency, not args.default, args.seconds)
+        print(
+            f"{concurrency:8d}  {result['appends_per_sec']:9.0f}"
+            f"  {result['lock_errors']:11d}  {result['read_p50_ms']:11.2f}"
+            f"  {result['read_p95_ms']:11.2f}"
+        )
@@ -0,0 +1,155 @@
+import asyncio
+import contextlib
+import fcntl
+import functools
+import logging
+import os
+import sqlite3
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy.engine import make_url
+
+logger = logging.getLogger(__name__)
+
+# Applied to every connection to the session database, including the ones
+# ADK's DatabaseSessionService opens. WAL lets readers run alongside the single
+# writer, busy_timeout makes writers from other workers wait for the lock
+# instead of failing with "database is locked", and synchronous=NORMAL skips
+# the fsync on every commit (safe in WAL mode; at worst the last
+# transactions are lost on power failure, never corrupted).
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "busy_timeout": 30000,
+    "cache_size": -32000,
+    "temp_store": "MEMORY",
+    "mmap_size": 268435456,
+    "foreign_keys": "ON",
+}
+
+# ADK's events primary key starts with the event id, so loading a session's
+# events would otherwise scan the whole table.
+INDEXES = [
+    "CREATE INDEX IF NOT EXISTS ix_events_session_timestamp"
+    " ON events (app_name, user_id, session_id, timestamp)",
+    "CREATE INDEX IF NOT EXISTS ix_sessions_update_time"
+    " ON sessions (update_time)",
+]
+
+
+def _connect_pooled(path: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+    for name, value in SQLITE_PRAGMAS.items():
+        conn.execute(f"PRAGMA {name}={value}")
+    return conn
+
+
+def session_db_kwargs(uri: str) -> dict:
+    """Engine options for `get_fast_api_app(session_db_kwargs=...)`.
+
+    For SQLite the engine opens its connections through a creator that
+    applies SQLITE_PRAGMAS, so other SQLite databases in the process keep
+    their own settings.
+    """
+    if not uri.startswith("sqlite"):
+        return {}
+    return {
+        "pool_size": int(os.environ.get("SESSION_DB_POOL_SIZE", 8)),
+        "max_overflow": int(os.environ.get("SESSION_DB_MAX_OVERFLOW", 8)),
+        "pool_timeout": 30,
+        "creator": functools.partial(_connect_pooled, make_url(uri).database),
+    }
+
+
+@contextlib.contextmanager
+def schema_lock(uri: str):
+    """Holds a file lock while the session database schema is created.
+
+    Server workers start at the same time and each one's
+    DatabaseSessionService runs CREATE TABLE; without the lock all but the
+    first fail with "table already exists".
+    """
+    if not uri.startswith("sqlite"):
+        yield
+        return
+    with open(f"{make_url(uri).database}.lock", "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        yield
+
+
+def _connect(path: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(path, timeout=30, isolation_level=None)
+    for name, value in SQLITE_PRAGMAS.items():
+        conn.execute(f"PRAGMA {name}={value}")
+    return conn
+
+
+def ensure_indexes(path: str):
+    with contextlib.closing(_connect(path)) as conn:
+        for statement in INDEXES:
+            conn.execute(statement)
+
+
+def compact(path: str, retention_days: float) -> int:
+    """Deletes sessions idle for `retention_days`, with their events.
+
+    Returns the number of sessions deleted. Also checkpoints the WAL so it
+    doesn't keep growing, and refreshes the query planner statistics.
+    """
+    cutoff = datetime.now(timezone.utc) - timedelta(days=retention_days)
+    cutoff = cutoff.strftime("%Y-%m-%d %H:%M:%S")
+    with contextlib.closing(_connect(path)) as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        conn.execute(
+            "DELETE FROM events WHERE (app_name, user_id, session_id) IN"
+            " (SELECT app_name, user_id, id FROM sessions WHERE update_time < ?)",
+            (cutoff,),
+        )
+        deleted = conn.execute(
+            "DELETE FROM sessions WHERE update_time < ?", (cutoff,)
+        ).rowcount
+        conn.execute("COMMIT")
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        conn.execute("PRAGMA optimize")
+    return deleted
+
+
+async def _compact_periodically(path: str, retention_days: float, interval: float):
+    while True:
+        try:
+            deleted = await asyncio.to_thread(compact, path, retention_days)
+            if deleted:
+                logger.info(f"Deleted {deleted} expired sessions from {path}")
+        except sqlite3.Error as e:
+            logger.error(f"Session compaction failed: {e}")
+        await asyncio.sleep(interval)
+
+
+def session_db_lifespan(uri: str):
+    """Lifespan that indexes the session database and compacts it.
+
+    Sessions idle for SESSION_RETENTION_DAYS (default 30) are deleted every
+    SESSION_COMPACT_INTERVAL_SECONDS (default 3600). Does nothing for
+    non-SQLite URIs.
+    """
+
+    @contextlib.asynccontextmanager
+    async def lifespan(app):
+        if not uri.startswith("sqlite"):
+            yield
+            return
+        path = make_url(uri).database
+        ensure_indexes(path)
+        task = asyncio.create_task(
+            _compact_periodically(
+                path,
+                float(os.environ.get("SESSION_RETENTION_DAYS", 30)),
+                float(os.environ.get("SESSION_COMPACT_INTERVAL_SECONDS", 3600)),
+            )
+        )
+        try:
+            yield
+        finally:
+            task.cancel()
+
+    return lifespan
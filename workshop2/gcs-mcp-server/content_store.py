@@ -0,0 +1,70 @@
+# gcs_mcp_server/content_store.py
+import collections
+import gzip
+import hashlib
+import threading
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Content-Encoding values this server writes and can read back.
+ENCODINGS = ("gzip", "zstd")
+
+# Custom metadata key of a dedup pointer: an empty object whose content is
+# stored once, under the content hash, at CONTENT_PREFIX + hash.
+POINTER_KEY = "content-sha256"
+
+def check_encoding(encoding: str):
+    if encoding not in ENCODINGS:
+        raise ValueError(f"Unsupported compression '{encoding}', expected one of {ENCODINGS}.")
+    if encoding == "zstd" and zstandard is None:
+        raise ValueError("zstd compression needs the zstandard package.")
+
+def compress(data: bytes, encoding: str) -> bytes:
+    if encoding == "gzip":
+        # mtime=0 keeps the output the same for the same input.
+        return gzip.compress(data, compresslevel=6, mtime=0)
+    if encoding == "zstd":
+        return zstandard.ZstdCompressor(level=3).compress(data)
+    raise ValueError(f"Unsupported compression '{encoding}'.")
+
+def decompress(data: bytes, encoding: str) -> bytes:
+    if encoding == "gzip":
+        return gzip.decompress(data)
+    if encoding == "zstd":
+        if zstandard is None:
+            raise ValueError("Reading zstd-encoded files needs the zstandard package.")
+        return zstandard.ZstdDecompressor().decompress(data)
+    raise ValueError(f"Unsupported Content-Encoding '{encoding}'.")
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+class HashIndex:
+    """Content hashes known to be stored, per bucket, most recent first.
+
+    Lets a duplicate write skip even the existence check. Bounded to
+    `max_entries`; a hash that has been evicted costs one existence check
+    the next time it is written. Used from the storage threads, so it locks.
+    """
+
+    def __init__(self, max_entries: int = 100000):
+        self.max_entries = max_entries
+        self._hashes = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def __contains__(self, key: tuple[str, str]) -> bool:
+        with self._lock:
+            if key in self._hashes:
+                self._hashes.move_to_end(key)
+                return True
+            return False
+
+    def add(self, key: tuple[str, str]):
+        with self._lock:
+            self._hashes[key] = None
+            self._hashes.move_to_end(key)
+            while len(self._hashes) > self.max_entries:
+                self._hashes.popitem(last=False)
@@ -0,0 +1,158 @@
+# gcs_mcp_server/listing_cache.py
+import bisect
+import collections
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+def next_key(key: str) -> str:
+    """Smallest string greater than every string that starts with `key`."""
+    return key[:-1] + chr(ord(key[-1]) + 1)
+
+def visible_ranges(start: str, end: str | None, hidden_prefix: str | None) -> list[tuple[str, str | None]]:
+    """Splits the name range [start, end) around the names under
+    `hidden_prefix`, so they can be left out of a GCS listing. An `end` of
+    None means no upper bound."""
+    if not hidden_prefix:
+        return [(start, end)] if end is None or start < end else []
+    hidden_start, hidden_end = hidden_prefix, next_key(hidden_prefix)
+    ranges = []
+    first_end = hidden_start if end is None else min(end, hidden_start)
+    if start < first_end:
+        ranges.append((start, first_end))
+    second_start = max(start, hidden_end)
+    if end is None or second_start < end:
+        ranges.append((second_start, end))
+    return ranges
+
+def encode_token(last_entry: str, is_prefix: bool) -> str:
+    """Page token that continues a listing after `last_entry`.
+
+    Tokens are a cursor on the blob name rather than an offset, so pages
+    stay consistent while files are added, and the same token works
+    whether the next page comes from the cache or from GCS.
+    """
+    return ("p:" if is_prefix else "f:") + last_entry
+
+def decode_token(token: str) -> tuple[str, bool]:
+    """Returns (start, exclusive): where to resume, and whether a file named
+    exactly `start` was already returned."""
+    kind, _, entry = token.partition(":")
+    if kind not in ("p", "f") or not entry:
+        raise ValueError(f"Invalid page token: {token!r}")
+    if kind == "p":
+        return next_key(entry), False
+    return entry, True
+
+def page_from_names(names: list[str], prefix: str, delimiter: str | None, page_token: str | None, page_size: int) -> dict:
+    """Lists one page of `names` (sorted) the way GCS would.
+
+    With a delimiter, names with the delimiter after `prefix` are rolled up
+    into a single "directory" prefix entry, like `gsutil ls`.
+    """
+    start, exclusive = decode_token(page_token) if page_token else (prefix, False)
+    if start < prefix:
+        start, exclusive = prefix, False
+    index = bisect.bisect_right(names, start) if exclusive else bisect.bisect_left(names, start)
+    files, prefixes = [], []
+    last = None
+    while index < len(names) and names[index].startswith(prefix):
+        if len(files) + len(prefixes) == page_size:
+            return {"files": files, "prefixes": prefixes, "next_page_token": encode_token(*last)}
+        name = names[index]
+        position = name.find(delimiter, len(prefix)) if delimiter else -1
+        if position == -1:
+            files.append(name)
+            last = (name, False)
+            index += 1
+        else:
+            directory = name[: position + len(delimiter)]
+            prefixes.append(directory)
+            last = (directory, True)
+            index = bisect.bisect_left(names, next_key(directory), index)
+    return {"files": files, "prefixes": prefixes, "next_page_token": None}
+
+def _insert(names: list[str], name: str):
+    index = bisect.bisect_left(names, name)
+    if index == len(names) or names[index] != name:
+        names.insert(index, name)
+
+class _Listing:
+    __slots__ = ("names", "expires")
+
+    def __init__(self, names: list[str] | None, expires: float):
+        # None marks a prefix with too many files to cache.
+        self.names = names
+        self.expires = expires
+
+class ListingCache:
+    """In-memory index of blob names per (bucket, prefix), refreshed after a TTL.
+
+    A cached listing of a prefix also serves listings of any longer prefix
+    inside it. Files this server writes are added to the cached listings
+    straight away, so they show up before the TTL expires; files written
+    or deleted by anyone else show up once it does.
+
+    Prefixes holding more than `max_names` files are not cached (that is
+    remembered for the TTL too) and are paged straight from GCS. Names under
+    `hidden_prefix` are never listed, so writes to it are not recorded.
+    Only used from the event loop, so it needs no locking.
+    """
+
+    def __init__(self, ttl_seconds: float = 60, max_names: int = 10000, max_prefixes: int = 64, hidden_prefix: str | None = None):
+        self.ttl_seconds = ttl_seconds
+        self.max_names = max_names
+        self.max_prefixes = max_prefixes
+        self.hidden_prefix = hidden_prefix
+        self._listings = collections.OrderedDict()
+        # Writes from the last few minutes, so a listing fetched while they
+        # were in flight can be brought up to date when it is stored.
+        self._recent_writes = collections.deque(maxlen=10000)
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0
+
+    def lookup(self, bucket_name: str, prefix: str) -> list[str] | None:
+        """Cached sorted names covering `prefix`, or None if it isn't cached."""
+        now = time.monotonic()
+        for key, listing in list(self._listings.items()):
+            if listing.expires <= now:
+                del self._listings[key]
+                continue
+            cached_bucket, cached_prefix = key
+            if cached_bucket == bucket_name and prefix.startswith(cached_prefix) and listing.names is not None:
+                self._listings.move_to_end(key)
+                self.hits += 1
+                return listing.names
+        self.misses += 1
+        return None
+
+    def is_too_large(self, bucket_name: str, prefix: str) -> bool:
+        listing = self._listings.get((bucket_name, prefix))
+        return listing is not None and listing.names is None and listing.expires > time.monotonic()
+
+    def store(self, bucket_name: str, prefix: str, names: list[str] | None, fetch_started: float):
+        """Caches `names` (sorted), fetched from GCS starting at `fetch_started`
+        (time.monotonic()), or None if there were too many to cache."""
+        if names is not None:
+            for written_at, written_bucket, name in self._recent_writes:
+                if written_at >= fetch_started and written_bucket == bucket_name and name.startswith(prefix):
+                    _insert(names, name)
+        self._listings[(bucket_name, prefix)] = _Listing(names, time.monotonic() + self.ttl_seconds)
+        self._listings.move_to_end((bucket_name, prefix))
+        while len(self._listings) > self.max_prefixes:
+            self._listings.popitem(last=False)
+        logger.debug(f"Cached listing of gs://{bucket_name}/{prefix}: {'too large' if names is None else len(names)}")
+
+    def record(self, bucket_name: str, name: str):
+        """Adds a file this server just wrote to the listings that contain it."""
+        if self.hidden_prefix and name.startswith(self.hidden_prefix):
+            return
+        self._recent_writes.append((time.monotonic(), bucket_name, name))
+        for (cached_bucket, cached_prefix), listing in self._listings.items():
+            if cached_bucket == bucket_name and listing.names is not None and name.startswith(cached_prefix):
+                _insert(listing.names, name)
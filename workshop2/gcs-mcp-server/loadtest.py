@@ -0,0 +1,112 @@
+"""Measures MCP tool latency with many concurrent clients.
+
+Run against a local fake GCS server, so nothing touches a real bucket:
+
+    docker run -d -p 4443:4443 fsouza/fake-gcs-server -scheme http
+    export STORAGE_EMULATOR_HOST=http://localhost:4443
+    python main.py &
+    python loadtest.py --clients 32 --large-clients 4
+
+To compare transports, start a second server with MCP_TRANSPORT=http and pass
+both URLs; each is measured in turn with the same load:
+
+    MCP_TRANSPORT=http PORT=8081 python main.py &
+    python loadtest.py --url http://localhost:8080/sse --url http://localhost:8081/mcp
+
+The transport is picked from the URL: /sse for SSE, anything else for
+streamable HTTP. Each client opens its own MCP session and repeatedly
+writes, reads back and lists a small summary. The `--large-clients` upload
+large files at the same time (MCP transports cap request bodies, at 4 MiB
+in recent versions, so keep `--large-mb` below that). If storage calls
+blocked the event loop, every small call would wait behind those uploads;
+compare the small-call latency with `--large-clients 0`.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import time
+import uuid
+
+from fastmcp import Client
+from google.api_core import exceptions as gcs_exceptions
+from google.auth.credentials import AnonymousCredentials
+from google.cloud import storage
+
+
+def create_bucket(bucket_name: str):
+    client = storage.Client(project="test-project", credentials=AnonymousCredentials())
+    try:
+        client.create_bucket(bucket_name)
+    except gcs_exceptions.Conflict:
+        pass
+
+
+async def _call(client, tool: str, arguments: dict, latencies, errors):
+    start = time.perf_counter()
+    try:
+        result = await client.call_tool(tool, arguments, timeout=60)
+        if json.loads(result.content[0].text)["status"] != "success":
+            raise RuntimeError(result.content[0].text)
+        latencies.setdefault(tool, []).append(time.perf_counter() - start)
+    except Exception:
+        errors.append(tool)
+
+
+async def _small_client(url: str, bucket: str, deadline: float, latencies, errors):
+    async with Client(url) as client:
+        while time.monotonic() < deadline:
+            name = f"loadtest/{uuid.uuid4().hex}.txt"
+            content = "Summary of today's news. " * 40
+            await _call(client, "create_gcs_file", {"bucket_name": bucket, "destination_blob_name": name, "content": content}, latencies, errors)
+            await _call(client, "read_gcs_file", {"bucket_name": bucket, "blob_name": name}, latencies, errors)
+            # Served from the listing cache, so this mostly measures the MCP
+            # transport itself.
+            await _call(client, "list_gcs_files", {"bucket_name": bucket, "prefix": "loadtest/", "page_size": 10}, latencies, errors)
+
+
+async def _large_client(url: str, bucket: str, deadline: float, size_mb: int, latencies, errors):
+    content = "x" * (size_mb * 1024 * 1024)
+    async with Client(url) as client:
+        while time.monotonic() < deadline:
+            name = f"loadtest/large-{uuid.uuid4().hex}.txt"
+            await _call(client, "create_gcs_file", {"bucket_name": bucket, "destination_blob_name": name, "content": content}, latencies, errors)
+
+
+async def run(url: str, bucket: str, clients: int, large_clients: int, large_mb: int, seconds: float) -> dict:
+    latencies, large_latencies, errors = {}, {}, []
+    deadline = time.monotonic() + seconds
+    await asyncio.gather(
+        *(_small_client(url, bucket, deadline, latencies, errors) for _ in range(clients)),
+        *(_large_client(url, bucket, deadline, large_mb, large_latencies, errors) for _ in range(large_clients)),
+    )
+    results = {}
+    for tool, values in [*latencies.items(), *((f"{tool} ({large_mb} MB)", values) for tool, values in large_latencies.items())]:
+        values.sort()
+        results[tool] = {
+            "calls_per_sec": len(values) / seconds,
+            "p50_ms": 1000 * statistics.median(values),
+            "p99_ms": 1000 * values[int(0.99 * (len(values) - 1))],
+        }
+    return {"tools": results, "errors": len(errors)}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", action="append", help="MCP endpoint; repeat to compare servers (default http://localhost:8080/sse)")
+    parser.add_argument("--bucket", default="loadtest")
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--large-clients", type=int, default=4)
+    parser.add_argument("--large-mb", type=int, default=3)
+    parser.add_argument("--seconds", type=float, default=20)
+    args = parser.parse_args()
+    if os.environ.get("STORAGE_EMULATOR_HOST"):
+        create_bucket(args.bucket)
+    for url in args.url or ["http://localhost:8080/sse"]:
+        result = asyncio.run(run(url, args.bucket, args.clients, args.large_clients, args.large_mb, args.seconds))
+        print(url)
+        for tool, stats in result["tools"].items():
+            print(f"  {tool}: {stats['calls_per_sec']:.1f} calls/s, p50 {stats['p50_ms']:.1f} ms, p99 {stats['p99_ms']:.1f} ms")
+        print(f"  {result['errors']} errors")
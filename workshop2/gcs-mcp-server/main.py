@@ -1,20 +1,89 @@
 # gcs_mcp_server/main.py
 import asyncio
+import base64
+import codecs
 import logging
 import os
 import json
+import time
 
+import requests
 from fastmcp import FastMCP
+from google.api_core import exceptions as gcs_exceptions
+from google.auth.credentials import AnonymousCredentials
 from google.cloud import storage
+from google.cloud.storage.retry import DEFAULT_RETRY
 from mcp import types as mcp_types
 
+from content_store import ENCODINGS, POINTER_KEY, HashIndex, check_encoding, compress, content_hash, decompress
+from listing_cache import ListingCache, decode_token, encode_token, next_key, page_from_names, visible_ranges
+from storage_io import StorageExecutor
+
 logger = logging.getLogger(__name__)
-logging.basicConfig(format="[%(levelname)s]: %(message)s", level=logging.INFO)
+logging.basicConfig(format="[%(levelname)s]: %(message)s", level=os.environ.get("LOG_LEVEL", "INFO").upper())
 
 mcp = FastMCP("GCS MCP Server")
 
+# Uploads larger than this are resumable and sent in CHUNK_SIZE pieces, so a
+# dropped connection only resends the current chunk. GCS requires chunks to
+# be a multiple of 256 KiB.
+RESUMABLE_THRESHOLD = int(os.environ.get("GCS_RESUMABLE_THRESHOLD_BYTES", 8 * 1024 * 1024))
+CHUNK_SIZE = int(os.environ.get("GCS_CHUNK_SIZE_KB", 8 * 1024)) // 256 * 256 * 1024
+# Reads return at most this many bytes per file, plus the offset to continue
+# from, so large files are streamed over several calls instead of held in
+# memory whole.
+MAX_READ_BYTES = int(os.environ.get("GCS_MAX_READ_BYTES", 4 * 1024 * 1024))
+MAX_BATCH_FILES = int(os.environ.get("GCS_MAX_BATCH_FILES", 1000))
+MAX_LIST_PAGE_SIZE = int(os.environ.get("GCS_MAX_LIST_PAGE_SIZE", 1000))
+# "gzip" or "zstd" stores files compressed, with the matching
+# Content-Encoding, when that makes them smaller. GCS serves gzip files
+# decompressed to clients that don't accept gzip; zstd files are only
+# decompressed by this server's read tools.
+COMPRESSION = os.environ.get("GCS_COMPRESSION", "off").lower()
+COMPRESSION_MIN_BYTES = int(os.environ.get("GCS_COMPRESSION_MIN_BYTES", 1024))
+if COMPRESSION != "off":
+    check_encoding(COMPRESSION)
+# With GCS_DEDUP=true each file's content is stored once, named by its
+# SHA-256 under GCS_CONTENT_PREFIX, and the file itself is an empty pointer
+# object; writing content that is already stored uploads only the pointer.
+# Content objects must be kept while pointers refer to them.
+DEDUP = os.environ.get("GCS_DEDUP", "false").lower() == "true"
+CONTENT_PREFIX = os.environ.get("GCS_CONTENT_PREFIX", ".content/sha256/")
+
+hash_index = HashIndex(max_entries=int(os.environ.get("GCS_DEDUP_INDEX_MAX_ENTRIES", 100000)))
+
+listing_cache = ListingCache(
+    ttl_seconds=float(os.environ.get("GCS_LIST_CACHE_TTL_SECONDS", 60)),
+    max_names=int(os.environ.get("GCS_LIST_CACHE_MAX_NAMES", 10000)),
+    max_prefixes=int(os.environ.get("GCS_LIST_CACHE_MAX_PREFIXES", 64)),
+    hidden_prefix=CONTENT_PREFIX,
+)
+
+# Storage calls are blocking, so tools run them through this instead of on
+# the event loop.
+storage_executor = StorageExecutor.from_env()
+
+def create_client():
+    # STORAGE_EMULATOR_HOST points the client at a local fake GCS such as
+    # fake-gcs-server, which doesn't check credentials.
+    if os.environ.get("STORAGE_EMULATOR_HOST"):
+        client = storage.Client(
+            project=os.environ.get("GOOGLE_CLOUD_PROJECT", "test-project"),
+            credentials=AnonymousCredentials(),
+        )
+    else:
+        client = storage.Client()
+    # requests keeps 10 connections per host by default; size the pool to the
+    # executor so concurrent calls reuse connections instead of opening and
+    # discarding new ones.
+    pool_size = storage_executor.max_workers
+    adapter = requests.adapters.HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    client._http.mount("https://", adapter)
+    client._http.mount("http://", adapter)
+    return client
+
 try:
-    storage_client = storage.Client()
+    storage_client = create_client()
     logger.info("Google Cloud Storage client initialized successfully..")
 except Exception as e:
     logger.error(f"Failed to initialize Google Cloud Storage client: {e}")
@@ -25,6 +94,168 @@ def check_client():
         raise Exception("Google Cloud Storage client is not initialized.")
     return True
 
+# The blocking helpers below run on storage_executor, which retries them, so
+# they turn off the client's own retries. Resumable uploads are the
+# exception: the client's retry resumes from the last chunk instead of
+# starting over.
+
+def put_object(bucket_name: str, blob_name: str, data: bytes, content_type: str, timeout: float, if_generation_match: int | None = None) -> int:
+    """Uploads `data`, compressed if configured, and returns the bytes stored."""
+    encoding = None
+    if COMPRESSION != "off" and len(data) >= COMPRESSION_MIN_BYTES:
+        compressed = compress(data, COMPRESSION)
+        if len(compressed) < len(data):
+            data, encoding = compressed, COMPRESSION
+    chunk_size = CHUNK_SIZE if len(data) > RESUMABLE_THRESHOLD else None
+    blob = storage_client.bucket(bucket_name).blob(blob_name, chunk_size=chunk_size)
+    blob.content_encoding = encoding
+    retry = DEFAULT_RETRY if chunk_size else None
+    blob.upload_from_string(data, content_type=content_type, timeout=timeout, retry=retry, if_generation_match=if_generation_match)
+    return len(data)
+
+def store_content(bucket_name: str, digest: str, data: bytes, content_type: str, timeout: float) -> int | None:
+    """Stores `data` under its hash unless it is already stored.
+
+    Returns the bytes uploaded, or None for a duplicate. The upload only
+    creates the object if it doesn't exist yet, so concurrent writers of
+    the same content don't race.
+    """
+    if (bucket_name, digest) in hash_index:
+        return None
+    blob = storage_client.bucket(bucket_name).blob(CONTENT_PREFIX + digest)
+    stored = None
+    if not blob.exists(timeout=timeout, retry=None):
+        try:
+            stored = put_object(bucket_name, blob.name, data, content_type, timeout, if_generation_match=0)
+        except gcs_exceptions.PreconditionFailed:
+            pass
+    hash_index.add((bucket_name, digest))
+    return stored
+
+def upload_blob(bucket_name: str, blob_name: str, content: str | bytes, content_type: str = "text/plain; charset=utf-8", timeout: float = 60) -> dict:
+    data = content.encode("utf-8") if isinstance(content, str) else content
+    if not DEDUP:
+        return {"bytes": len(data), "stored_bytes": put_object(bucket_name, blob_name, data, content_type, timeout)}
+    digest = content_hash(data)
+    stored = store_content(bucket_name, digest, data, content_type, timeout)
+    pointer = storage_client.bucket(bucket_name).blob(blob_name)
+    pointer.metadata = {POINTER_KEY: digest}
+    pointer.upload_from_string(b"", content_type=content_type, timeout=timeout, retry=None)
+    return {"bytes": len(data), "stored_bytes": stored or 0, "deduplicated": stored is None}
+
+def read_content(bucket_name: str, blob_name: str, offset: int, length: int, timeout: float) -> bytes:
+    """Up to `length` bytes of a blob's content from `offset`.
+
+    Follows dedup pointers and decompresses compressed blobs. Plain blobs
+    take one ranged request. The Content-Encoding comes back with the
+    download, and metadata is only fetched when the range is empty, as it is
+    for pointers. A compressed blob can't be read by range, so it is
+    downloaded whole unless the first request already got all of it.
+    """
+    blob = storage_client.bucket(bucket_name).blob(blob_name)
+    try:
+        data = blob.download_as_bytes(start=offset, end=offset + length - 1, raw_download=True, timeout=timeout, retry=None)
+    except gcs_exceptions.RequestRangeNotSatisfiable:
+        data = b""
+    if not data:
+        blob.reload(timeout=timeout, retry=None)
+        digest = (blob.metadata or {}).get(POINTER_KEY)
+        if digest:
+            return read_content(bucket_name, CONTENT_PREFIX + digest, offset, length, timeout)
+    if blob.content_encoding in ENCODINGS:
+        if offset or len(data) >= length:
+            data = blob.download_as_bytes(raw_download=True, timeout=timeout, retry=None)
+        return decompress(data, blob.content_encoding)[offset:offset + length]
+    return data
+
+def download_range(bucket_name: str, blob_name: str, offset: int = 0, max_bytes: int = MAX_READ_BYTES, encoding: str = "text", timeout: float = 60) -> dict:
+    """Reads up to `max_bytes` of a blob starting at `offset`.
+
+    One byte more than requested is fetched to tell whether the blob
+    continues, which saves a metadata request. Text is cut at a character
+    boundary, so `next_offset` may be slightly less than offset + max_bytes.
+    """
+    max_bytes = max(1, min(max_bytes, MAX_READ_BYTES))
+    data = read_content(bucket_name, blob_name, offset, max_bytes + 1, timeout)
+    more = len(data) > max_bytes
+    data = data[:max_bytes]
+    if encoding == "base64":
+        content = base64.b64encode(data).decode("ascii")
+        consumed = len(data)
+    else:
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        content = decoder.decode(data, final=not more)
+        consumed = len(data) - len(decoder.getstate()[0])
+    return {
+        "name": blob_name,
+        "content": content,
+        "encoding": encoding,
+        "offset": offset,
+        "next_offset": offset + consumed if more else None,
+    }
+
+def listing_ranges(prefix: str, start: str) -> list[tuple[str, str | None]]:
+    """Name ranges to list under `prefix` from `start`, leaving out the
+    content objects under CONTENT_PREFIX, which aren't files of their own."""
+    return visible_ranges(max(start, prefix), next_key(prefix) if prefix else None, CONTENT_PREFIX)
+
+def fetch_names(bucket_name: str, prefix: str, limit: int, timeout: float = 60) -> list[str] | None:
+    """All blob names under `prefix`, or None if there are more than `limit`."""
+    names = []
+    for start, end in listing_ranges(prefix, prefix):
+        blobs = storage_client.list_blobs(
+            bucket_name,
+            prefix=prefix or None,
+            start_offset=start or None,
+            end_offset=end,
+            max_results=limit + 1 - len(names),
+            page_size=1000,
+            fields="items(name),nextPageToken",
+            timeout=timeout,
+            retry=None,
+        )
+        names.extend(blob.name for blob in blobs)
+        if len(names) > limit:
+            return None
+    return names
+
+def list_page(bucket_name: str, prefix: str, delimiter: str | None, page_token: str | None, page_size: int, timeout: float = 60) -> dict:
+    """Lists one page straight from GCS, resuming after `page_token`."""
+    start, exclusive = decode_token(page_token) if page_token else (prefix, False)
+    # Entry name -> whether it is a prefix. GCS orders files and prefixes
+    # together by name; sorting the merged names restores that order.
+    entries = {}
+    more = False
+    for range_start, range_end in listing_ranges(prefix, start):
+        blobs = storage_client.list_blobs(
+            bucket_name,
+            prefix=prefix or None,
+            delimiter=delimiter or None,
+            start_offset=range_start or None,
+            end_offset=range_end,
+            page_size=page_size + 1,
+            fields="items(name),prefixes,nextPageToken",
+            timeout=timeout,
+            retry=None,
+        )
+        for page in blobs.pages:
+            entries.update((blob.name, False) for blob in page if not (exclusive and blob.name == start))
+            entries.update((directory, True) for directory in page.prefixes)
+            if len(entries) > page_size:
+                break
+        if len(entries) > page_size:
+            more = True
+            break
+        more = blobs.next_page_token is not None
+    names = sorted(entries)
+    more = more or len(names) > page_size
+    names = names[:page_size]
+    return {
+        "files": [name for name in names if not entries[name]],
+        "prefixes": [name for name in names if entries[name]],
+        "next_page_token": encode_token(names[-1], entries[names[-1]]) if more and names else None,
+    }
+
 @mcp.tool()
 async def create_gcs_file(bucket_name: str, destination_blob_name: str, content: str) -> mcp_types.TextContent:
     """Creates a new file (blob) in a GCS bucket with the given content.
@@ -37,44 +268,167 @@ async def create_gcs_file(bucket_name: str, destination_blob_name: str, content:
     check_client()
     logger.info(f"Attempting to create file '{destination_blob_name}' in bucket '{bucket_name}'.")
     try:
-        bucket = storage_client.bucket(bucket_name)
-        blob = bucket.blob(destination_blob_name)
-        blob.upload_from_string(content)
+        result = await storage_executor.run(bucket_name, upload_blob, bucket_name, destination_blob_name, content)
+        listing_cache.record(bucket_name, destination_blob_name)
         msg = f"File '{destination_blob_name}' created successfully in bucket '{bucket_name}'."
         logger.info(msg)
-        return mcp_types.TextContent(type="text", text=json.dumps({"status": "success", "message": msg}))
+        return mcp_types.TextContent(type="text", text=json.dumps({"status": "success", "message": msg, **result}))
     except Exception as e:
         logger.error(f"Error creating file: {e}")
         return mcp_types.TextContent(type="text", text=json.dumps({"status": "error", "message": str(e)}))
 
 @mcp.tool()
-async def list_gcs_files(bucket_name: str, prefix: str = None) -> mcp_types.TextContent:
-    """Lists all files (blobs) in a GCS bucket, optionally filtered by a prefix.
+async def write_gcs_files(bucket_name: str, files: dict[str, str]) -> mcp_types.TextContent:
+    """Creates many files (blobs) in a GCS bucket in one call. The uploads run concurrently.
+
+    Args:
+        bucket_name: Name of the bucket in which the files need to be created.
+        files: Maps the name of each file to create to its contents.
+    """
+    check_client()
+    if len(files) > MAX_BATCH_FILES:
+        msg = f"At most {MAX_BATCH_FILES} files can be written per call, got {len(files)}."
+        return mcp_types.TextContent(type="text", text=json.dumps({"status": "error", "message": msg}))
+    logger.info(f"Writing {len(files)} files to bucket '{bucket_name}'.")
+    outcomes = await asyncio.gather(
+        *(storage_executor.run(bucket_name, upload_blob, bucket_name, name, content) for name, content in files.items()),
+        return_exceptions=True,
+    )
+    results = []
+    for name, outcome in zip(files, outcomes):
+        if isinstance(outcome, Exception):
+            logger.error(f"Error creating file '{name}': {outcome}")
+            results.append({"name": name, "status": "error", "message": str(outcome)})
+        else:
+            listing_cache.record(bucket_name, name)
+            results.append({"name": name, "status": "success", **outcome})
+    failed = sum(result["status"] == "error" for result in results)
+    msg = f"Created {len(results) - failed} of {len(results)} files in bucket '{bucket_name}'."
+    logger.info(msg)
+    status = "error" if failed else "success"
+    return mcp_types.TextContent(type="text", text=json.dumps({"status": status, "message": msg, "results": results}))
+
+@mcp.tool()
+async def read_gcs_file(bucket_name: str, blob_name: str, offset: int = 0, max_bytes: int = MAX_READ_BYTES, encoding: str = "text") -> mcp_types.TextContent:
+    """Reads a file (blob) from a GCS bucket, or a byte range of it.
+
+    Large files are returned in parts: when `next_offset` in the result is
+    not null, call again with `offset` set to it to read the rest.
+
+    Args:
+        bucket_name: The name of the GCS bucket.
+        blob_name: Name of the file to read.
+        offset: Byte offset to start reading at.
+        max_bytes: Maximum number of bytes to return.
+        encoding: "text" to return UTF-8 text, "base64" for binary files.
+    """
+    check_client()
+    logger.info(f"Reading file '{blob_name}' from bucket '{bucket_name}' at offset {offset}.")
+    try:
+        result = await storage_executor.run(bucket_name, download_range, bucket_name, blob_name, offset, max_bytes, encoding)
+        return mcp_types.TextContent(type="text", text=json.dumps({"status": "success", **result}))
+    except Exception as e:
+        logger.error(f"Error reading file: {e}")
+        return mcp_types.TextContent(type="text", text=json.dumps({"status": "error", "message": str(e)}))
+
+@mcp.tool()
+async def read_gcs_files(bucket_name: str, blob_names: list[str], max_bytes: int = MAX_READ_BYTES, encoding: str = "text") -> mcp_types.TextContent:
+    """Reads many files (blobs) from a GCS bucket in one call. The downloads run concurrently.
+
+    Each file is read from the start, up to `max_bytes`; use read_gcs_file
+    with `next_offset` to read the rest of any file that was cut off.
+
+    Args:
+        bucket_name: The name of the GCS bucket.
+        blob_names: Names of the files to read.
+        max_bytes: Maximum number of bytes to return per file.
+        encoding: "text" to return UTF-8 text, "base64" for binary files.
+    """
+    check_client()
+    if len(blob_names) > MAX_BATCH_FILES:
+        msg = f"At most {MAX_BATCH_FILES} files can be read per call, got {len(blob_names)}."
+        return mcp_types.TextContent(type="text", text=json.dumps({"status": "error", "message": msg}))
+    logger.info(f"Reading {len(blob_names)} files from bucket '{bucket_name}'.")
+    outcomes = await asyncio.gather(
+        *(storage_executor.run(bucket_name, download_range, bucket_name, name, 0, max_bytes, encoding) for name in blob_names),
+        return_exceptions=True,
+    )
+    results = []
+    for name, outcome in zip(blob_names, outcomes):
+        if isinstance(outcome, Exception):
+            logger.error(f"Error reading file '{name}': {outcome}")
+            results.append({"name": name, "status": "error", "message": str(outcome)})
+        else:
+            results.append({"status": "success", **outcome})
+    failed = sum(result["status"] == "error" for result in results)
+    status = "error" if failed else "success"
+    return mcp_types.TextContent(type="text", text=json.dumps({"status": status, "files": results}))
+
+@mcp.tool()
+async def list_gcs_files(bucket_name: str, prefix: str = None, delimiter: str = None, page_size: int = MAX_LIST_PAGE_SIZE, page_token: str = None) -> mcp_types.TextContent:
+    """Lists files (blobs) in a GCS bucket, optionally filtered by a prefix, one page at a time.
+
+    When `next_page_token` in the result is not null, there are more files;
+    call again with `page_token` set to it to get the next page. Content
+    stored once for deduplicated files is not listed.
 
     Args:
         bucket_name (str): The name of the GCS bucket.
         prefix (str, optional): A prefix to filter the listed files.
+        delimiter (str, optional): Set to "/" to list one directory level:
+            the files directly under the prefix, and its subdirectories in `prefixes`.
+        page_size (int, optional): Maximum number of files and prefixes to return.
+        page_token (str, optional): `next_page_token` from the previous page.
     """
     check_client()
+    prefix = prefix or ""
+    page_size = max(1, min(page_size, MAX_LIST_PAGE_SIZE))
     logger.info(f"Listing files in bucket '{bucket_name}' with prefix '{prefix}'.")
     try:
-        bucket = storage_client.get_bucket(bucket_name)
-        blobs = bucket.list_blobs(prefix=prefix)
-        files = [blob.name for blob in blobs]
-        logger.info(f"Files found: {files}")
-        return mcp_types.TextContent(type="text", text=json.dumps({"status": "success", "files": files}))
+        names = listing_cache.lookup(bucket_name, prefix) if listing_cache.enabled else None
+        if names is None and listing_cache.enabled and not listing_cache.is_too_large(bucket_name, prefix):
+            fetch_started = time.monotonic()
+            names = await storage_executor.run(bucket_name, fetch_names, bucket_name, prefix, listing_cache.max_names)
+            listing_cache.store(bucket_name, prefix, names, fetch_started)
+        if names is not None:
+            page = page_from_names(names, prefix, delimiter, page_token, page_size)
+        else:
+            page = await storage_executor.run(bucket_name, list_page, bucket_name, prefix, delimiter, page_token, page_size)
+        logger.info(f"Found {len(page['files'])} files and {len(page['prefixes'])} prefixes.")
+        logger.debug(f"Files found: {page['files']}")
+        return mcp_types.TextContent(type="text", text=json.dumps({"status": "success", **page}))
     except Exception as e:
         logger.error(f"Error listing files: {e}")
         return mcp_types.TextContent(type="text", text=json.dumps({"status": "error", "message": str(e)}))
 
 if __name__ == "__main__":
     port = int(os.environ.get("PORT", 8080))
-    logger.info(f"GCS MCP server starting on port {port}")
-    asyncio.run(
-        mcp.run_async(
-            transport="sse",
-            host="0.0.0.0",
-            port=port,
+    # "sse" holds a long-lived stream per client at /sse, so each client
+    # sticks to one instance. "http" serves streamable HTTP at /mcp,
+    # statelessly: every request is a plain JSON POST that any instance can
+    # answer, so Cloud Run can spread requests across instances and clients
+    # can reuse keep-alive connections.
+    transport = os.environ.get("MCP_TRANSPORT", "sse")
+    logger.info(f"GCS MCP server starting on port {port} ({transport})")
+    if transport == "http":
+        asyncio.run(
+            mcp.run_async(
+                transport="http",
+                host="0.0.0.0",
+                port=port,
+                path="/mcp",
+                stateless_http=True,
+                json_response=True,
+                # Longer than the Google front end's 600s idle timeout, so it
+                # never reuses a connection the server has already closed.
+                uvicorn_config={"timeout_keep_alive": int(os.environ.get("KEEP_ALIVE_SECONDS", 620))},
+            )
+        )
+    else:
+        asyncio.run(
+            mcp.run_async(
+                transport="sse",
+                host="0.0.0.0",
+                port=port,
+            )
         )
-    )
-
@@ -0,0 +1,113 @@
+# gcs_mcp_server/storage_io.py
+import asyncio
+import functools
+import logging
+import os
+import random
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from google.api_core import exceptions as gcs_exceptions
+
+logger = logging.getLogger(__name__)
+
+# Errors worth another attempt: throttling, server errors, and connections
+# that failed or timed out.
+RETRYABLE_ERRORS = (
+    gcs_exceptions.TooManyRequests,
+    gcs_exceptions.InternalServerError,
+    gcs_exceptions.BadGateway,
+    gcs_exceptions.ServiceUnavailable,
+    gcs_exceptions.GatewayTimeout,
+    requests.exceptions.ConnectionError,
+    requests.exceptions.ChunkedEncodingError,
+    requests.exceptions.Timeout,
+    asyncio.TimeoutError,
+)
+
+class StorageExecutor:
+    """Runs blocking google-cloud-storage calls off the event loop.
+
+    Calls run on a thread pool of `max_workers` threads. A call only takes a
+    thread when one is free, and at most `per_bucket_limit` calls run
+    against one bucket at a time, so a burst against one bucket can't take
+    every thread. Each attempt must finish within `call_timeout` seconds;
+    retryable errors are retried up to `max_attempts` times, with
+    exponential backoff and full jitter. The backoff sleeps on the event
+    loop rather than in a thread, which is why calls should pass retry=None
+    to the storage client.
+
+    A timed-out attempt's thread keeps running until its HTTP request times
+    out (the `timeout` passed to the call), and it keeps its slot until
+    then, so the pool is never oversubscribed.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 32,
+        per_bucket_limit: int = 16,
+        call_timeout: float = 120,
+        request_timeout: float = 60,
+        max_attempts: int = 4,
+        initial_backoff: float = 0.5,
+        max_backoff: float = 16,
+    ):
+        self.max_workers = max_workers
+        self.per_bucket_limit = per_bucket_limit
+        self.call_timeout = call_timeout
+        self.request_timeout = request_timeout
+        self.max_attempts = max_attempts
+        self.initial_backoff = initial_backoff
+        self.max_backoff = max_backoff
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="gcs")
+        self._workers = None
+        self._buckets = {}
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            max_workers=int(os.environ.get("GCS_MAX_WORKERS", 32)),
+            per_bucket_limit=int(os.environ.get("GCS_PER_BUCKET_CONCURRENCY", 16)),
+            call_timeout=float(os.environ.get("GCS_CALL_TIMEOUT_SECONDS", 120)),
+            request_timeout=float(os.environ.get("GCS_REQUEST_TIMEOUT_SECONDS", 60)),
+            max_attempts=int(os.environ.get("GCS_MAX_ATTEMPTS", 4)),
+        )
+
+    async def run(self, bucket_name: str, func, *args, **kwargs):
+        """Calls `func(*args, timeout=request_timeout, **kwargs)` on the pool."""
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                return await self._run_once(bucket_name, func, *args, **kwargs)
+            except RETRYABLE_ERRORS as e:
+                if attempt == self.max_attempts:
+                    raise
+                delay = random.uniform(0, min(self.max_backoff, self.initial_backoff * 2 ** (attempt - 1)))
+                logger.warning(f"{func.__name__} on bucket '{bucket_name}' failed ({type(e).__name__}: {e}), retrying in {delay:.2f}s.")
+                await asyncio.sleep(delay)
+
+    async def _run_once(self, bucket_name: str, func, *args, **kwargs):
+        if self._workers is None:
+            self._workers = asyncio.Semaphore(self.max_workers)
+        bucket_slots = self._buckets.get(bucket_name)
+        if bucket_slots is None:
+            bucket_slots = self._buckets[bucket_name] = asyncio.Semaphore(self.per_bucket_limit)
+        await bucket_slots.acquire()
+        try:
+            await self._workers.acquire()
+        except BaseException:
+            bucket_slots.release()
+            raise
+
+        def release(future):
+            self._workers.release()
+            bucket_slots.release()
+            # Marks the error of an attempt that already timed out as seen.
+            if not future.cancelled():
+                future.exception()
+
+        call = functools.partial(func, *args, timeout=self.request_timeout, **kwargs)
+        future = asyncio.get_running_loop().run_in_executor(self._executor, call)
+        future.add_done_callback(release)
+        # shield() keeps a timeout from cancelling the future, which would
+        # release the slots while the thread is still busy.
+        return await asyncio.wait_for(asyncio.shield(future), self.call_timeout)
@@ -1,19 +1,25 @@
 # news_gcs_agent/main.py
 import os
-import uvicorn
 from fastapi import FastAPI
 from google.adk.cli.fast_api import get_fast_api_app
 
+from news_assistant_agent.agent import gcs_tools
+from news_assistant_agent.cached_toolset import toolsets_lifespan
+from serve import serve
+
 # The directory containing this main.py file
 AGENTS_DIR = os.path.dirname(os.path.abspath(__file__))
 
 app: FastAPI = get_fast_api_app(
     agents_dir=AGENTS_DIR,
     web=True, # Keep the web UI for testing
+    # Connects to the GCS MCP server and loads its tools before serving.
+    lifespan=toolsets_lifespan(*gcs_tools),
 )
 
 if __name__ == "__main__":
-    port = int(os.environ.get("PORT", 8080))
-    uvicorn.run(app, host="0.0.0.0", port=port)
+    # Prefer `python serve.py`: this process has already built the app, and
+    # with more than one worker each worker builds its own.
+    serve("main:app")
 
 
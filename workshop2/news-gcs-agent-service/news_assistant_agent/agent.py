@@ -1,9 +1,11 @@
 # news_gcs_agent/news_assistant_agent/agent.py test
 import os
 from google.adk.agents import LlmAgent
-from google.adk.tools.mcp_tool.mcp_toolset import MCPToolset, StdioConnectionParams, SseConnectionParams, StdioServerParameters
+from google.adk.tools.mcp_tool.mcp_toolset import MCPToolset, StdioConnectionParams, SseConnectionParams, StdioServerParameters, StreamableHTTPConnectionParams
 from dotenv import load_dotenv
 
+from .cached_toolset import CachedMCPToolset
+
 load_dotenv()
 
 GCS_MCP_SERVER_URL = os.environ.get("GCS_MCP_SERVER_URL")
@@ -11,17 +13,34 @@ if not GCS_MCP_SERVER_URL:
     print("WARNING: GCS_MCP_SERVER_URL environment variable not set. The tool for GCS operations will not be available.")
     GCS_MCP_SERVER_URL="https://gcs-mcp-server-554461076311.us-central1.run.app"
 
-# Toolset for the remote GCS MCP Server (using SSE)
+# "sse" or "http"; must match the server's MCP_TRANSPORT. With "http" the
+# server is stateless, so Cloud Run can send each request to any instance.
+GCS_MCP_TRANSPORT = os.environ.get("GCS_MCP_TRANSPORT", "sse")
+
+# Toolset for the remote GCS MCP Server
 gcs_tools = []
 if GCS_MCP_SERVER_URL:
-    gcs_toolset = MCPToolset(
-        connection_params=SseConnectionParams(
+    if GCS_MCP_TRANSPORT == "http":
+        connection_params = StreamableHTTPConnectionParams(
+            url=f"{GCS_MCP_SERVER_URL}/mcp",
+            timeout=30
+        )
+    else:
+        connection_params = SseConnectionParams(
             # MODIFIED: Connect to the correct /sse endpoint
             url=f"{GCS_MCP_SERVER_URL}/sse",
             headers={"Accept": "text/event-stream, application/json"},
             timeout=30
-        ),
-        tool_filter=['create_gcs_file', 'list_gcs_files']
+        )
+    # Keeps the MCP session open and the tool list cached, so agent turns
+    # don't wait on the MCP handshake or list_tools; main.py starts it with
+    # the app.
+    gcs_toolset = CachedMCPToolset(
+        connection_params=connection_params,
+        cache_path=os.environ.get("GCS_MCP_TOOLS_CACHE_PATH"),
+        health_check_seconds=float(os.environ.get("GCS_MCP_HEALTH_CHECK_SECONDS", 30)),
+        refresh_seconds=float(os.environ.get("GCS_MCP_TOOLS_REFRESH_SECONDS", 300)),
+        tool_filter=['create_gcs_file', 'write_gcs_files', 'read_gcs_file', 'read_gcs_files', 'list_gcs_files']
     )
     gcs_tools.append(gcs_toolset)
 
@@ -41,7 +60,7 @@ You are an intelligent assistant whose primary function is to generate summaries
 #### Core Capabilities & Limitations
 
 1.  **Knowledge Source (Generative):** When a user asks for "news," "headlines," "trends," or summaries, you must generate this content yourself using your internal knowledge. You must synthesize summaries of major events, topics, and developments up to your last knowledge cutoff.
-2.  **Storage Tools (Actions):** create_gcs_file, list_gcs_files
+2.  **Storage Tools (Actions):** create_gcs_file, write_gcs_files, read_gcs_file, read_gcs_files, list_gcs_files
 
 #### Available Tools
 
@@ -53,9 +72,28 @@ You MUST use ONLY the tools provided in this list.
         * `destination_blob_name` (string): The full path and filename for the new file within the bucket (e.g., `reports/q3_summary.txt`).
         * `content` (string): The text content to write into the file.
 
-2.  **`list_gcs_files`**: Lists the files (blobs) currently stored within a specified GCS bucket.
+2.  **`write_gcs_files`**: Saves several files to a GCS bucket in a single call. Prefer it over repeated `create_gcs_file` calls whenever you archive more than one file.
+    * **Parameters**:
+        * `bucket_name` (string): The name of the GCS bucket.
+        * `files` (object): Maps each file path (e.g., `reports/ai.txt`) to the text content to write into it.
+
+3.  **`read_gcs_file`**: Reads back the content of a file stored in a GCS bucket.
+    * **Parameters**:
+        * `bucket_name` (string): The name of the GCS bucket.
+        * `blob_name` (string): The path of the file to read.
+        * `offset` (integer, optional): Where to continue reading. If a result has a non-null `next_offset`, the file is longer; call again with that offset to read the rest.
+
+4.  **`read_gcs_files`**: Reads several files from a GCS bucket in a single call.
+    * **Parameters**:
+        * `bucket_name` (string): The name of the GCS bucket.
+        * `blob_names` (list of strings): The paths of the files to read.
+
+5.  **`list_gcs_files`**: Lists the files (blobs) currently stored within a specified GCS bucket.
     * **Parameters**:
         * `bucket_name` (string): The name of the GCS bucket to inspect.
+        * `prefix` (string, optional): Only list files whose path starts with this prefix.
+        * `delimiter` (string, optional): Set to `/` to list a single folder level; subfolders are returned in `prefixes`.
+        * `page_token` (string, optional): Results are paged. If a result has a non-null `next_page_token`, call again with it to get the next page.
 
 #### Required Workflow: News Generation & Archival
 
@@ -66,8 +104,8 @@ When a user asks you to provide news and save it, you must follow this specific
     * Present this summary to the user.
 
 2.  **Step 2: Archive Content (Tool Task)**
-    * After generating the content (or if the user explicitly asks to save specific text), you MUST use the `create_gcs_file` tool.
-    * The `content` parameter for `create_gcs_file` MUST be the exact summary or text you generated in Step 1.
+    * After generating the content (or if the user explicitly asks to save specific text), you MUST use the `create_gcs_file` tool, or `write_gcs_files` when saving several files.
+    * The content you save MUST be the exact summary or text you generated in Step 1.
     """,
     tools=all_tools,
 )
@@ -0,0 +1,271 @@
+# news_gcs_agent/news_assistant_agent/cached_toolset.py
+import asyncio
+import contextlib
+import hashlib
+import json
+import logging
+import os
+
+from google.adk.tools.mcp_tool.mcp_session_manager import MCPSessionManager
+from google.adk.tools.mcp_tool.mcp_tool import MCPTool
+from google.adk.tools.mcp_tool.mcp_toolset import MCPToolset
+from mcp import types as mcp_types
+
+logger = logging.getLogger(__name__)
+
+
+def fingerprint(tools: list[mcp_types.Tool]) -> str:
+    """Hash of the tools' names, descriptions and schemas."""
+    payload = json.dumps(
+        [tool.model_dump(mode="json", exclude_none=True) for tool in tools],
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+
+class OwnedSessionManager(MCPSessionManager):
+    """MCPSessionManager that opens and closes sessions from a single task.
+
+    The MCP clients use anyio task groups, which must be exited by the task
+    that entered them. ADK opens a session from whichever task first needs
+    one (a tool call, a tool listing) and may close or replace it from
+    another. Here every open and close is handed to one owner task, started
+    on first use; returning a session that is already open needs no handoff.
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._requests = None
+        self._owner = None
+
+    async def create_session(self, headers=None):
+        entry = self._sessions.get(self._generate_session_key(self._merge_headers(headers)))
+        if entry is not None and not self._is_session_disconnected(entry[0]):
+            return entry[0]
+        return await self._in_owner(super().create_session, headers)
+
+    async def close(self):
+        await self._in_owner(super().close)
+
+    async def stop(self):
+        """Closes all sessions and ends the owner task."""
+        if self._owner is None or self._owner.done():
+            return
+        await self.close()
+        await self._requests.put((None, (), None))
+        await self._owner
+
+    async def _in_owner(self, func, *args):
+        if asyncio.current_task() is self._owner:
+            return await func(*args)
+        if self._owner is None or self._owner.done():
+            self._requests = asyncio.Queue()
+            self._owner = asyncio.create_task(self._serve(self._requests), name="mcp-session-owner")
+        future = asyncio.get_running_loop().create_future()
+        await self._requests.put((func, args, future))
+        return await future
+
+    async def _serve(self, requests: asyncio.Queue):
+        try:
+            while True:
+                func, args, future = await requests.get()
+                if func is None:
+                    return
+                try:
+                    result = await func(*args)
+                except asyncio.CancelledError:
+                    future.cancel()
+                    raise
+                except Exception as e:
+                    if not future.done():
+                        future.set_exception(e)
+                else:
+                    # The caller may have given up waiting.
+                    if not future.done():
+                        future.set_result(result)
+        finally:
+            while not requests.empty():
+                _, _, future = requests.get_nowait()
+                if future is not None and not future.done():
+                    future.set_exception(RuntimeError("MCP session owner task stopped."))
+
+
+class CachedMCPToolset(MCPToolset):
+    """MCPToolset with a warm session and a cached tool list.
+
+    MCPToolset asks the server for its tools on every model call, after
+    opening a session if it has none, so turns wait on the MCP handshake and
+    list_tools. This one keeps the tools in memory. `start()` (run it at app
+    startup) opens the session and loads them, then a background task pings
+    the server every `health_check_seconds` and reconnects, with backoff,
+    when the ping fails. The tools are listed again after a reconnect and
+    every `refresh_seconds`, and replaced when their fingerprint changes.
+
+    With `cache_path`, the tool list is also saved to disk, so an instance
+    that starts while the server is unreachable still has its tools. The
+    cache is keyed by server URL.
+
+    Sessions are opened and closed through an OwnedSessionManager, so the
+    tool calls and listings of request tasks and the background task's
+    reconnects all leave that to one owner task.
+    """
+
+    def __init__(
+        self,
+        *,
+        cache_path: str | None = None,
+        health_check_seconds: float = 30,
+        refresh_seconds: float = 300,
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+        self._mcp_session_manager = OwnedSessionManager(
+            connection_params=self._connection_params,
+            errlog=self._errlog,
+        )
+        self._cache_path = cache_path
+        self._health_check_seconds = health_check_seconds
+        self._refresh_seconds = refresh_seconds
+        self._url = getattr(self._connection_params, "url", None)
+        self._tools = None
+        self.fingerprint = None
+        self._lock = None
+        self._monitor = None
+        self._ready = None
+        self._stopping = None
+        self._load_cache()
+
+    async def get_tools(self, readonly_context=None):
+        if self._tools is None:
+            if self._lock is None:
+                self._lock = asyncio.Lock()
+            async with self._lock:
+                if self._tools is None:
+                    await self._refresh_tools()
+        return [
+            tool for tool in self._tools
+            if self._is_tool_selected(tool, readonly_context)
+        ]
+
+    async def _refresh_tools(self):
+        session = await self._mcp_session_manager.create_session()
+        result = await session.list_tools()
+        self._set_tools(result.tools)
+
+    def _set_tools(self, tools: list[mcp_types.Tool], save: bool = True):
+        new_fingerprint = fingerprint(tools)
+        if new_fingerprint == self.fingerprint:
+            return
+        if self.fingerprint is not None:
+            logger.info(f"MCP tools at {self._url} changed ({self.fingerprint} -> {new_fingerprint}).")
+        self._tools = [
+            MCPTool(
+                mcp_tool=tool,
+                mcp_session_manager=self._mcp_session_manager,
+                auth_scheme=self._auth_scheme,
+                auth_credential=self._auth_credential,
+            )
+            for tool in tools
+        ]
+        self.fingerprint = new_fingerprint
+        if save:
+            self._save_cache(tools)
+
+    def _load_cache(self):
+        if not self._cache_path or not os.path.exists(self._cache_path):
+            return
+        try:
+            with open(self._cache_path) as f:
+                cached = json.load(f)
+            if cached["url"] != self._url:
+                return
+            tools = [mcp_types.Tool.model_validate(tool) for tool in cached["tools"]]
+            self._set_tools(tools, save=False)
+            logger.info(f"Loaded {len(tools)} cached MCP tools for {self._url} ({self.fingerprint}).")
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Ignoring MCP tool cache {self._cache_path}: {e}")
+
+    def _save_cache(self, tools: list[mcp_types.Tool]):
+        if not self._cache_path:
+            return
+        try:
+            temp_path = f"{self._cache_path}.{os.getpid()}.tmp"
+            with open(temp_path, "w") as f:
+                json.dump({
+                    "url": self._url,
+                    "fingerprint": self.fingerprint,
+                    "tools": [tool.model_dump(mode="json", exclude_none=True) for tool in tools],
+                }, f)
+            os.replace(temp_path, self._cache_path)
+        except OSError as e:
+            logger.warning(f"Could not save MCP tool cache {self._cache_path}: {e}")
+
+    async def start(self, timeout: float = 10):
+        """Connects and loads the tools, waiting at most `timeout` seconds.
+
+        If the server doesn't answer in time, startup goes on with the
+        cached tools, if any, and the background task keeps retrying.
+        """
+        if self._monitor is not None:
+            return
+        self._ready = asyncio.Event()
+        self._stopping = asyncio.Event()
+        self._monitor = asyncio.create_task(self._monitor_connection())
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout)
+        except asyncio.TimeoutError:
+            state = "using cached tools" if self._tools is not None else "no tools yet"
+            logger.warning(f"MCP server at {self._url} not ready after {timeout}s ({state}); retrying in the background.")
+
+    async def stop(self):
+        if self._monitor is not None:
+            self._stopping.set()
+            await self._monitor
+            self._monitor = None
+        await self._mcp_session_manager.stop()
+
+    async def _monitor_connection(self):
+        loop = asyncio.get_running_loop()
+        last_refresh = None
+        failures = 0
+        delay = 0
+        while True:
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._stopping.wait(), delay)
+            if self._stopping.is_set():
+                break
+            try:
+                if last_refresh is None or loop.time() - last_refresh >= self._refresh_seconds:
+                    await self._refresh_tools()
+                    last_refresh = loop.time()
+                    self._ready.set()
+                else:
+                    # create_session() reconnects if the session's streams
+                    # have closed; the ping catches servers that went away
+                    # without closing them.
+                    session = await self._mcp_session_manager.create_session()
+                    await asyncio.wait_for(session.send_ping(), self._health_check_seconds)
+                failures = 0
+                delay = self._health_check_seconds
+            except Exception as e:
+                failures += 1
+                delay = min(2 ** (failures - 1), self._health_check_seconds)
+                # The server may have been redeployed with other tools.
+                last_refresh = None
+                logger.warning(f"MCP server at {self._url} unreachable ({type(e).__name__}: {e}); reconnecting in {delay:.0f}s.")
+                await self._mcp_session_manager.close()
+        await self.close()
+
+
+def toolsets_lifespan(*toolsets: CachedMCPToolset):
+    """FastAPI lifespan that starts the toolsets with the app."""
+
+    @contextlib.asynccontextmanager
+    async def lifespan(app):
+        await asyncio.gather(*(toolset.start() for toolset in toolsets))
+        try:
+            yield
+        finally:
+            await asyncio.gather(*(toolset.stop() for toolset in toolsets))
+
+    return lifespan
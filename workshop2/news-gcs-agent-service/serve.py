@@ -0,0 +1,52 @@
+"""Production launcher for the FastAPI app in main.py.
+
+    python serve.py [module:app]
+
+Settings come from the environment:
+    PORT                       listen port (default 8080)
+    WEB_CONCURRENCY            worker processes (default 1)
+    UVICORN_LOOP               auto | uvloop | asyncio (default auto)
+    UVICORN_HTTP               auto | httptools | h11 (default auto)
+    KEEP_ALIVE_SECONDS         idle keep-alive timeout (default 620)
+    GRACEFUL_SHUTDOWN_SECONDS  time to drain requests on SIGTERM (default 8)
+    LIMIT_CONCURRENCY          max in-flight requests per worker (default none)
+
+The app is passed to uvicorn as an import string, so each worker imports
+main.py itself and gets its own agents, clients and caches; nothing
+created at import time is shared between processes. main.py keeps sessions
+in memory, so a session created on one worker is not found on another; only
+raise WEB_CONCURRENCY once main.py passes a shared, database-backed
+session_service_uri. "auto" uses uvloop and httptools when they are
+installed (uvicorn[standard]).
+"""
+
+import os
+import sys
+
+import uvicorn
+
+
+def serve(app: str = "main:app"):
+    limit_concurrency = os.environ.get("LIMIT_CONCURRENCY")
+    uvicorn.run(
+        app,
+        host="0.0.0.0",
+        port=int(os.environ.get("PORT", 8080)),
+        workers=int(os.environ.get("WEB_CONCURRENCY", 1)),
+        loop=os.environ.get("UVICORN_LOOP", "auto"),
+        http=os.environ.get("UVICORN_HTTP", "auto"),
+        # Longer than the Google front end's 600s idle timeout, so it never
+        # reuses a connection the worker has already closed.
+        timeout_keep_alive=int(os.environ.get("KEEP_ALIVE_SECONDS", 620)),
+        # Cloud Run sends SIGKILL 10s after SIGTERM.
+        timeout_graceful_shutdown=int(
+            os.environ.get("GRACEFUL_SHUTDOWN_SECONDS", 8)
+        ),
+        limit_concurrency=int(limit_concurrency) if limit_concurrency else None,
+        proxy_headers=True,
+        forwarded_allow_ips="*",
+    )
+
+
+if __name__ == "__main__":
+    serve(sys.argv[1] if len(sys.argv) > 1 else "main:app")
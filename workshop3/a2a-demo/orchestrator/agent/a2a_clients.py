@@ -0,0 +1,156 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import dataclasses
+import logging
+import os
+import time
+from typing import Optional
+
+from a2a.types import AgentCard
+from google.adk.agents.remote_a2a_agent import RemoteA2aAgent
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# One keep-alive HTTP/2 pool for all A2A traffic, so card fetches and agent
+# calls to the same Cloud Run service share connections and TLS sessions.
+a2a_httpx_client = httpx.AsyncClient(
+    http2=True,
+    timeout=httpx.Timeout(600.0, connect=10.0),
+    limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+)
+
+
+@dataclasses.dataclass
+class _CachedCard:
+  card: AgentCard
+  etag: Optional[str]
+  fetched_at: float
+
+
+class AgentCardCache:
+  """Caches agent cards by URL with TTL and ETag revalidation.
+
+  Cards younger than `ttl` seconds are served from memory. Older cards are
+  revalidated with If-None-Match, and a failed refresh keeps serving the
+  last known card. `start_refresh` revalidates all cached cards in the
+  background so requests rarely wait on a card fetch. A card that changed
+  replaces the cached one, and CachedRemoteA2aAgent switches to it on its
+  next run.
+  """
+
+  def __init__(self, client: httpx.AsyncClient, ttl: float = 300):
+    self.client = client
+    self.ttl = ttl
+    self._cards = {}
+    self._locks = {}
+    self._refresh_task = None
+
+  async def _fetch(self, url: str) -> AgentCard:
+    cached = self._cards.get(url)
+    headers = {'If-None-Match': cached.etag} if cached and cached.etag else {}
+    try:
+      response = await self.client.get(url, headers=headers)
+      if response.status_code == 304 and cached:
+        cached.fetched_at = time.monotonic()
+        return cached.card
+      response.raise_for_status()
+      card = AgentCard.model_validate(response.json())
+      if cached and card == cached.card:
+        # Same card without ETag support: keep the object agents compare.
+        card = cached.card
+    except (httpx.HTTPError, ValueError) as e:
+      if cached is None:
+        raise
+      logger.warning('Keeping cached agent card for %s: %s', url, e)
+      return cached.card
+    self._cards[url] = _CachedCard(
+        card=card,
+        etag=response.headers.get('ETag'),
+        fetched_at=time.monotonic(),
+    )
+    return card
+
+  async def get(self, url: str) -> AgentCard:
+    cached = self._cards.get(url)
+    if cached and time.monotonic() - cached.fetched_at < self.ttl:
+      return cached.card
+    lock = self._locks.setdefault(url, asyncio.Lock())
+    async with lock:
+      cached = self._cards.get(url)
+      if cached and time.monotonic() - cached.fetched_at < self.ttl:
+        return cached.card
+      return await self._fetch(url)
+
+  async def prefetch(self, urls: list[str]):
+    """Resolves `urls` concurrently; failures are logged, not raised."""
+    results = await asyncio.gather(
+        *(self.get(url) for url in urls), return_exceptions=True
+    )
+    for url, result in zip(urls, results):
+      if isinstance(result, Exception):
+        logger.warning('Could not pre-resolve agent card %s: %s', url, result)
+
+  async def _refresh_loop(self):
+    while True:
+      await asyncio.sleep(self.ttl / 2)
+      for url in list(self._cards):
+        try:
+          await self._fetch(url)
+        except Exception as e:
+          logger.warning('Agent card refresh failed for %s: %s', url, e)
+
+  def start_refresh(self):
+    if self._refresh_task is None:
+      self._refresh_task = asyncio.create_task(self._refresh_loop())
+
+  async def stop(self):
+    if self._refresh_task is not None:
+      self._refresh_task.cancel()
+      self._refresh_task = None
+
+
+agent_card_cache = AgentCardCache(
+    a2a_httpx_client, ttl=float(os.environ.get('AGENT_CARD_TTL_SECONDS', 300))
+)
+
+
+class CachedRemoteA2aAgent(RemoteA2aAgent):
+  """RemoteA2aAgent that resolves its card through the shared cache.
+
+  RemoteA2aAgent resolves its card once and keeps it. This one checks the
+  cache before every run, which costs a dict lookup while the card is
+  fresh, and rebuilds its A2A client when the cache holds a different card,
+  e.g. after the remote agent was redeployed with a new URL or skills.
+  """
+
+  def __init__(self, **kwargs):
+    kwargs.setdefault('httpx_client', a2a_httpx_client)
+    super().__init__(**kwargs)
+
+  async def _ensure_resolved(self) -> None:
+    source = self._agent_card_source or ''
+    if not source.startswith(('http://', 'https://')):
+      return await super()._ensure_resolved()
+    card = await agent_card_cache.get(source)
+    if self._is_resolved and card is self._agent_card:
+      return
+    if self._is_resolved:
+      logger.info('Agent card for %s changed, reconnecting', self.name)
+    self._agent_card = card
+    self._a2a_client = None
+    self._is_resolved = False
+    await super()._ensure_resolved()
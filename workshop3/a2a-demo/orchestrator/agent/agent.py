@@ -11,15 +11,24 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-import urllib.error
-import urllib.request
+import os
+import re
+from typing import Optional
 
+import httpx
+from google.adk.agents.callback_context import CallbackContext
 from google.adk.agents.llm_agent import Agent
 from google.adk.agents.remote_a2a_agent import AGENT_CARD_WELL_KNOWN_PATH
-from google.adk.agents.remote_a2a_agent import RemoteA2aAgent
+from google.adk.models import LlmRequest
+from google.adk.models import LlmResponse
 from google.adk.tools.example_tool import ExampleTool
+from google.adk.tools.tool_context import ToolContext
 from google.genai import types
 
+from .a2a_clients import CachedRemoteA2aAgent
+from .article_fetch import fetcher
+from .fanout import FanOutAgent
+
 
 # --- Sentiment Analyzer Agent ---
 REMOTE_SENTIMENT_AGENT_URL = "https://sentiment-analyzer-agent-xxxxxxxx.us-central1.run.app"
@@ -28,19 +37,82 @@ REMOTE_SENTIMENT_AGENT_URL = "https://sentiment-analyzer-agent-xxxxxxxx.us-centr
 # --- Business Analyzer Agent ---
 REMOTE_BUSINESS_AGENT_URL = "https://business-analyzer-agent-xxxxxxxx.us-central1.run.app"
 
+# Agent cards resolved at startup, see main.py.
+REMOTE_AGENT_CARD_URLS = [
+    f"{REMOTE_SENTIMENT_AGENT_URL}{AGENT_CARD_WELL_KNOWN_PATH}",
+    f"{REMOTE_BUSINESS_AGENT_URL}{AGENT_CARD_WELL_KNOWN_PATH}",
+]
 
-# --- Summarizer Sub-Agent ---
-def summarize_article(article: str) -> str:
-  """Summarizes a news article."""
-  return f"This is a summary of the article: {article[:100]}..."
 
-def get_news_article(article_url: str) -> str:
+# --- Summarizer Sub-Agent ---
+SHORT_SUMMARY_REQUEST = re.compile(
+    r"\b(short|brief|quick|one[- ]line|tl;?dr)\b", re.IGNORECASE
+)
+# Set by get_news_article, read by short_summary_callback. Holds only the
+# URL; the text stays in the fetcher's cache instead of the session.
+LATEST_ARTICLE_STATE_KEY = "temp:latest_news_article"
+
+
+def summarize_article(article: str, max_sentences: int = 3) -> str:
+  """Summarizes a news article.
+
+  Args:
+      article: The full text of the article.
+      max_sentences: The number of sentences to keep in the summary.
+  """
+  # Imported on first use: it pulls in NumPy, which startup doesn't need.
+  from .summarizer import summarize
+
+  return summarize(article, max_sentences)
+
+
+async def short_summary_callback(
+    callback_context: CallbackContext, llm_request: LlmRequest
+) -> Optional[LlmResponse]:
+  """Answers short summary requests locally instead of calling the model.
+
+  The article is found through session state: get_news_article is called
+  by root_agent, and ADK turns other agents' tool results into plain text
+  before they reach this agent's request.
+  """
+  user_content = callback_context.user_content
+  user_text = "".join(
+      part.text for part in (user_content.parts if user_content else []) if part.text
+  )
+  if not SHORT_SUMMARY_REQUEST.search(user_text):
+    return None
+  fetched = callback_context.state.get(LATEST_ARTICLE_STATE_KEY)
+  # Only an article fetched for this request; older ones may be unrelated.
+  if not fetched or fetched["invocation_id"] != callback_context.invocation_id:
+    return None
+  try:
+    # Served from the fetcher's cache, which get_news_article just filled.
+    article = await fetcher.fetch(fetched["url"])
+  except httpx.HTTPError:
+    return None
+  summary = summarize_article(article, 2)
+  # Too short to extract from; let the model answer.
+  if not summary:
+    return None
+  return LlmResponse(
+      content=types.Content(
+          role="model",
+          parts=[types.Part(text=f"Summary: {summary}")],
+      )
+  )
+
+async def get_news_article(article_url: str, tool_context: ToolContext) -> str:
   """Get a news article from a URL."""
   try:
-    with urllib.request.urlopen(article_url) as response:
-      return response.read().decode('utf-8')
-  except urllib.error.URLError as e:
+    article = await fetcher.fetch(article_url)
+  except httpx.HTTPError as e:
+    tool_context.state[LATEST_ARTICLE_STATE_KEY] = None
     return f'Error fetching article: {e}'
+  tool_context.state[LATEST_ARTICLE_STATE_KEY] = {
+      "invocation_id": tool_context.invocation_id,
+      "url": article_url,
+  }
+  return article
 
 
 
@@ -53,6 +125,7 @@ summarizer_agent = Agent(
       When asked to summarize an article, you must call the summarize_article tool with the article content.
     """,
     tools=[summarize_article],
+    before_model_callback=short_summary_callback,
 )
 
 
@@ -107,7 +180,7 @@ example_tool = ExampleTool([
     },
 ])
 
-sentiment_analyzer_agent = RemoteA2aAgent(
+sentiment_analyzer_agent = CachedRemoteA2aAgent(
     name="sentiment_analyzer_agent",
     description="Agent that handles analyzing the sentiment of news articles.",
     agent_card=(
@@ -116,7 +189,7 @@ sentiment_analyzer_agent = RemoteA2aAgent(
     ),
 )
 
-business_analyzer_agent = RemoteA2aAgent(
+business_analyzer_agent = CachedRemoteA2aAgent(
     name="business_analyzer_agent",
     description="Agent that handles analyzing the business impact of news articles.",
     agent_card=(
@@ -125,6 +198,33 @@ business_analyzer_agent = RemoteA2aAgent(
     ),
 )
 
+# An agent can only have one parent, so the parallel stage gets its own
+# clients for the same remote agents.
+news_analysis_fanout_agent = FanOutAgent(
+    name="news_analysis_fanout_agent",
+    description=(
+        "Analyzes the sentiment and the business impact of news articles"
+        " at the same time."
+    ),
+    sub_agents=[
+        CachedRemoteA2aAgent(
+            name="fanout_sentiment_analyzer_agent",
+            description="Agent that handles analyzing the sentiment of news articles.",
+            agent_card=f"{REMOTE_SENTIMENT_AGENT_URL}{AGENT_CARD_WELL_KNOWN_PATH}",
+        ),
+        CachedRemoteA2aAgent(
+            name="fanout_business_analyzer_agent",
+            description="Agent that handles analyzing the business impact of news articles.",
+            agent_card=f"{REMOTE_BUSINESS_AGENT_URL}{AGENT_CARD_WELL_KNOWN_PATH}",
+        ),
+    ],
+    branch_timeout=float(os.environ.get("FANOUT_BRANCH_TIMEOUT_SECONDS", 120)),
+    section_titles={
+        "fanout_sentiment_analyzer_agent": "Sentiment",
+        "fanout_business_analyzer_agent": "Business impact",
+    },
+)
+
 
 root_agent = Agent(
     model="gemini-2.0-flash",
@@ -138,10 +238,16 @@ root_agent = Agent(
       3. If the user asks for business impact analysis, delegate to the business_analyzer_agent with article content as input.
       4. If the user asks to summarize an article and then analyze its sentiment, call summarizer_agent with article content as input, then pass the result to sentiment_analyzer_agent.
       5. If the user asks to summarize an article and then analyze its business impact, call summarizer_agent with article content as input, then pass the result to business_analyzer_agent.
+      6. If the user asks for both sentiment and business impact analysis, delegate once to the news_analysis_fanout_agent with article content as input; it runs both analyses in parallel and returns the combined result.
       Always clarify the results before proceeding.
     """,
     global_instruction="You are NewsBot, ready to analyze news articles.",
-    sub_agents=[summarizer_agent, sentiment_analyzer_agent, business_analyzer_agent],
+    sub_agents=[
+        summarizer_agent,
+        sentiment_analyzer_agent,
+        business_analyzer_agent,
+        news_analysis_fanout_agent,
+    ],
     tools=[get_news_article, example_tool],
 )
 
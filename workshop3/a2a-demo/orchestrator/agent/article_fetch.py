@@ -0,0 +1,251 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import codecs
+import collections
+import dataclasses
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from typing import Optional
+
+import httpx
+
+from .article_extract import ArticleExtractor
+from .article_extract import estimate_tokens
+from .article_extract import truncate_to_budget
+
+logger = logging.getLogger(__name__)
+
+
+@dataclasses.dataclass
+class CachedArticle:
+  url: str
+  text: str
+  etag: Optional[str] = None
+  last_modified: Optional[str] = None
+  fetched_at: float = 0.0
+  truncated: bool = False
+
+
+class ArticleFetcher:
+  """Fetches articles as LLM-ready text over pooled HTTP connections.
+
+  HTML is converted to plain text while it streams in (see ArticleExtractor)
+  and trimmed to `token_budget`; the extracted text is what gets cached.
+
+  Articles are cached in memory (LRU) and optionally on disk, keyed by URL.
+  Entries younger than `fresh_seconds` are served without a request; older
+  ones are revalidated with If-None-Match / If-Modified-Since. Bodies are
+  streamed and cut off at `max_body_bytes`, and concurrent fetches of the
+  same URL share a single request. All network and disk I/O is async or runs
+  off the event loop, so slow sites only delay their own callers.
+  """
+
+  def __init__(
+      self,
+      max_body_bytes: int = 2 * 1024 * 1024,
+      max_entries: int = 256,
+      fresh_seconds: float = 300,
+      cache_dir: Optional[str] = None,
+      connect_timeout: float = 5.0,
+      read_timeout: float = 10.0,
+      max_connections: int = 256,
+      token_budget: int = 4000,
+  ):
+    self.max_body_bytes = max_body_bytes
+    self.token_budget = token_budget
+    self.max_entries = max_entries
+    self.fresh_seconds = fresh_seconds
+    self.cache_dir = cache_dir
+    if cache_dir:
+      os.makedirs(cache_dir, exist_ok=True)
+    self._client = httpx.AsyncClient(
+        timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+        follow_redirects=True,
+        limits=httpx.Limits(
+            max_connections=max_connections, max_keepalive_connections=32
+        ),
+    )
+    self._memory = collections.OrderedDict()
+    self._inflight = {}
+    self._lock = threading.Lock()
+    self._stats = collections.Counter()
+
+  @classmethod
+  def from_env(cls) -> 'ArticleFetcher':
+    return cls(
+        max_body_bytes=int(os.getenv('ARTICLE_MAX_BYTES', 2 * 1024 * 1024)),
+        max_entries=int(os.getenv('ARTICLE_CACHE_ENTRIES', 256)),
+        fresh_seconds=float(os.getenv('ARTICLE_CACHE_TTL_SECONDS', 300)),
+        cache_dir=os.getenv('ARTICLE_CACHE_DIR'),
+        connect_timeout=float(os.getenv('ARTICLE_CONNECT_TIMEOUT', 5)),
+        read_timeout=float(os.getenv('ARTICLE_READ_TIMEOUT', 10)),
+        token_budget=int(os.getenv('ARTICLE_TOKEN_BUDGET', 4000)),
+    )
+
+  def _disk_path(self, url: str) -> str:
+    digest = hashlib.sha256(url.encode('utf-8')).hexdigest()
+    return os.path.join(self.cache_dir, f'{digest}.json')
+
+  def _read_disk(self, url: str) -> Optional[CachedArticle]:
+    try:
+      with open(self._disk_path(url), encoding='utf-8') as f:
+        return CachedArticle(**json.load(f))
+    except (OSError, ValueError, TypeError):
+      return None
+
+  def _write_disk(self, entry: CachedArticle):
+    path = self._disk_path(entry.url)
+    tmp_path = f'{path}.{threading.get_ident()}.tmp'
+    try:
+      with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(dataclasses.asdict(entry), f)
+      os.replace(tmp_path, path)
+    except OSError as e:
+      logger.warning('Could not write article cache entry: %s', e)
+
+  async def _lookup(self, url: str) -> Optional[CachedArticle]:
+    with self._lock:
+      entry = self._memory.get(url)
+      if entry is not None:
+        self._memory.move_to_end(url)
+        return entry
+    if not self.cache_dir:
+      return None
+    entry = await asyncio.to_thread(self._read_disk, url)
+    if entry is not None:
+      self._remember(entry)
+    return entry
+
+  def _remember(self, entry: CachedArticle):
+    with self._lock:
+      self._memory[entry.url] = entry
+      self._memory.move_to_end(entry.url)
+      while len(self._memory) > self.max_entries:
+        self._memory.popitem(last=False)
+
+  async def _download(
+      self, url: str, cached: Optional[CachedArticle]
+  ) -> CachedArticle:
+    headers = {}
+    if cached is not None:
+      if cached.etag:
+        headers['If-None-Match'] = cached.etag
+      if cached.last_modified:
+        headers['If-Modified-Since'] = cached.last_modified
+    async with self._client.stream('GET', url, headers=headers) as response:
+      if response.status_code == 304 and cached is not None:
+        self._stats['revalidated'] += 1
+        return dataclasses.replace(cached, fetched_at=time.time())
+      response.raise_for_status()
+      is_html = 'html' in response.headers.get('Content-Type', 'text/html')
+      decoder = codecs.getincrementaldecoder(response.encoding or 'utf-8')(
+          errors='replace'
+      )
+      extractor = ArticleExtractor()
+      plain_parts = []
+      bytes_in = 0
+      # Stop reading once the budget is spent instead of draining the body.
+      async for chunk in response.aiter_bytes():
+        chunk = chunk[: self.max_body_bytes - bytes_in]
+        bytes_in += len(chunk)
+        text = decoder.decode(chunk)
+        if is_html:
+          extractor.feed_chunk(text, len(chunk))
+        else:
+          plain_parts.append(text)
+        if bytes_in >= self.max_body_bytes:
+          break
+      tail = decoder.decode(b'', final=True)
+      if is_html:
+        extractor.feed_chunk(tail, 0)
+        article = extractor.finish(self.token_budget)
+        text, truncated = article.text, article.truncated
+      else:
+        plain_parts.append(tail)
+        text, truncated = truncate_to_budget(
+            ''.join(plain_parts).splitlines(), self.token_budget
+        )
+      tokens_out = estimate_tokens(text)
+      self._stats['bytes_fetched'] += bytes_in
+      self._stats['tokens_out'] += tokens_out
+      logger.info(
+          'Fetched %s: %d bytes in, ~%d tokens out', url, bytes_in, tokens_out
+      )
+      return CachedArticle(
+          url=url,
+          text=text,
+          etag=response.headers.get('ETag'),
+          last_modified=response.headers.get('Last-Modified'),
+          fetched_at=time.time(),
+          truncated=truncated or bytes_in >= self.max_body_bytes,
+      )
+
+  async def fetch(self, url: str) -> str:
+    """Returns the article body for `url`, using the cache when possible."""
+    cached = await self._lookup(url)
+    if cached is not None and time.time() - cached.fetched_at < self.fresh_seconds:
+      self._stats['hits'] += 1
+      return cached.text
+
+    future = self._inflight.get(url)
+    if future is not None:
+      self._stats['coalesced'] += 1
+      try:
+        return (await asyncio.shield(future)).text
+      except asyncio.CancelledError:
+        if not future.cancelled():
+          raise
+        # The caller that owned the request went away; fetch it ourselves.
+        return await self.fetch(url)
+
+    future = asyncio.get_running_loop().create_future()
+    self._inflight[url] = future
+    self._stats['misses'] += 1
+    try:
+      entry = await self._download(url, cached)
+      self._remember(entry)
+      if self.cache_dir:
+        await asyncio.to_thread(self._write_disk, entry)
+      future.set_result(entry)
+      return entry.text
+    except asyncio.CancelledError:
+      future.cancel()
+      raise
+    except Exception as e:
+      self._stats['errors'] += 1
+      future.set_exception(e)
+      # Waiters re-raise the error; keep the loop from reporting it unseen.
+      future.exception()
+      raise
+    finally:
+      self._inflight.pop(url, None)
+
+  async def aclose(self):
+    """Closes the pooled HTTP client."""
+    await self._client.aclose()
+
+  def metrics(self) -> dict[str, int]:
+    """Returns cache and network counters."""
+    with self._lock:
+      cached_entries = len(self._memory)
+    return {'cached_entries': cached_entries, **self._stats}
+
+
+fetcher = ArticleFetcher.from_env()
@@ -0,0 +1,114 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import logging
+from typing import AsyncGenerator
+
+from google.adk.agents import BaseAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event
+from google.genai import types
+
+logger = logging.getLogger(__name__)
+
+_DONE = object()
+
+
+class FanOutAgent(BaseAgent):
+  """Runs independent sub-agents concurrently and merges their answers.
+
+  Each sub-agent runs on its own branch of the invocation, so remote agents
+  are called in parallel rather than one after another. Events are forwarded
+  as they arrive. A sub-agent that fails or exceeds `branch_timeout` seconds
+  is reported in the merged answer instead of failing the whole request.
+  """
+
+  branch_timeout: float = 120.0
+  """Seconds each sub-agent may run before it is abandoned."""
+
+  section_titles: dict[str, str] = {}
+  """Heading for each sub-agent's section of the merged answer."""
+
+  def _branch_ctx(
+      self, sub_agent: BaseAgent, ctx: InvocationContext
+  ) -> InvocationContext:
+    branch_ctx = ctx.model_copy()
+    suffix = f'{self.name}.{sub_agent.name}'
+    branch_ctx.branch = f'{ctx.branch}.{suffix}' if ctx.branch else suffix
+    return branch_ctx
+
+  async def _run_branch(
+      self,
+      sub_agent: BaseAgent,
+      ctx: InvocationContext,
+      events: asyncio.Queue,
+      answers: dict[str, str],
+  ):
+    try:
+      async with asyncio.timeout(self.branch_timeout):
+        async for event in sub_agent.run_async(self._branch_ctx(sub_agent, ctx)):
+          if event.is_final_response() and event.content and event.content.parts:
+            text = ''.join(p.text for p in event.content.parts if p.text)
+            if text:
+              answers[sub_agent.name] = text
+          await events.put(event)
+    except TimeoutError:
+      logger.warning(
+          '%s timed out after %ss', sub_agent.name, self.branch_timeout
+      )
+      answers.setdefault(
+          sub_agent.name,
+          f'(no result: timed out after {self.branch_timeout:g}s)',
+      )
+    except Exception as e:
+      logger.error('%s failed: %s', sub_agent.name, e)
+      answers.setdefault(sub_agent.name, f'(no result: {e})')
+    finally:
+      await events.put(_DONE)
+
+  async def _run_async_impl(
+      self, ctx: InvocationContext
+  ) -> AsyncGenerator[Event, None]:
+    events = asyncio.Queue()
+    answers = {}
+    tasks = [
+        asyncio.create_task(self._run_branch(sub_agent, ctx, events, answers))
+        for sub_agent in self.sub_agents
+    ]
+    try:
+      remaining = len(tasks)
+      while remaining:
+        event = await events.get()
+        if event is _DONE:
+          remaining -= 1
+        else:
+          yield event
+    finally:
+      for task in tasks:
+        task.cancel()
+
+    sections = []
+    for sub_agent in self.sub_agents:
+      title = self.section_titles.get(sub_agent.name, sub_agent.name)
+      answer = answers.get(sub_agent.name, '(no result)')
+      sections.append(f'### {title}\n{answer}')
+    yield Event(
+        invocation_id=ctx.invocation_id,
+        author=self.name,
+        branch=ctx.branch,
+        content=types.Content(
+            role='model', parts=[types.Part(text='\n\n'.join(sections))]
+        ),
+    )
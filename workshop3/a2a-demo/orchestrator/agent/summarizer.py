@@ -0,0 +1,88 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import re
+
+import numpy as np
+
+_SENTENCE_SPLIT = re.compile(r'(?<=[.!?])["\')\]]?\s+(?=[A-Z0-9"\'(\[])')
+_WORD = re.compile(r"[a-z0-9][a-z0-9'-]*")
+STOPWORDS = frozenset("""
+a about above after again against all am an and any are as at be because
+been before being below between both but by can could did do does doing
+down during each few for from further had has have having he her here hers
+him his how i if in into is it its itself just me more most my no nor not
+now of off on once only or other our ours out over own said same she should
+so some such than that the their theirs them then there these they this
+those through to too under until up very was we were what when where which
+while who whom why will with would you your yours also says new one two
+""".split())
+
+
+def split_sentences(text: str) -> list[str]:
+  sentences = []
+  for block in text.splitlines():
+    block = block.strip()
+    if block:
+      sentences.extend(s.strip() for s in _SENTENCE_SPLIT.split(block))
+  return [s for s in sentences if len(s.split()) >= 3]
+
+
+def _tfidf(sentences: list[str]) -> np.ndarray:
+  """Returns L2-normalised TF-IDF rows, one per sentence."""
+  vocabulary = {}
+  rows, cols = [], []
+  for i, sentence in enumerate(sentences):
+    for word in _WORD.findall(sentence.lower()):
+      if word not in STOPWORDS:
+        rows.append(i)
+        cols.append(vocabulary.setdefault(word, len(vocabulary)))
+  counts = np.zeros((len(sentences), max(1, len(vocabulary))))
+  np.add.at(counts, (rows, cols), 1.0)
+  document_frequency = np.count_nonzero(counts, axis=0)
+  idf = np.log((1 + len(sentences)) / (1 + document_frequency)) + 1.0
+  weights = np.log1p(counts) * idf
+  norms = np.linalg.norm(weights, axis=1, keepdims=True)
+  return weights / np.where(norms == 0, 1.0, norms)
+
+
+def _textrank(similarity: np.ndarray, damping=0.85, iterations=50) -> np.ndarray:
+  np.fill_diagonal(similarity, 0.0)
+  out_weight = similarity.sum(axis=1, keepdims=True)
+  transition = similarity / np.where(out_weight == 0, 1.0, out_weight)
+  n = len(similarity)
+  scores = np.full(n, 1.0 / n)
+  for _ in range(iterations):
+    updated = (1 - damping) / n + damping * (transition.T @ scores)
+    if np.abs(updated - scores).sum() < 1e-6:
+      return updated
+    scores = updated
+  return scores
+
+
+def summarize(text: str, max_sentences: int = 3) -> str:
+  """Returns the `max_sentences` most central sentences in original order.
+
+  Sentences are embedded as TF-IDF vectors and ranked with TextRank over
+  their cosine similarity graph, with a small boost for leading sentences
+  since news articles put key facts first.
+  """
+  sentences = split_sentences(text)
+  if len(sentences) <= max_sentences:
+    return ' '.join(sentences)
+  vectors = _tfidf(sentences)
+  scores = _textrank(vectors @ vectors.T)
+  scores *= 1.0 + 0.5 / np.arange(1, len(sentences) + 1)
+  top = np.sort(np.argsort(-scores)[:max_sentences])
+  return ' '.join(sentences[i] for i in top)
@@ -0,0 +1,161 @@
+"""Measures get_news_article latency under many concurrent sessions.
+
+Serves a stub article from a local server that answers after `--latency-ms`
+and has `--sessions` concurrent sessions fetch it, comparing:
+
+    blocking   the previous urllib fetch, run inline on the event loop as
+               ADK runs a sync tool
+    async      ArticleFetcher, each session fetching its own article
+    coalesced  ArticleFetcher, every session fetching the same article
+
+    python fetch_benchmark.py --sessions 200 --latency-ms 100
+
+Latency is measured from when all sessions start, so queueing counts. Also
+reports the event loop lag (the longest a sleeping task was woken late)
+while the sessions ran, and how many requests reached the stub server.
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import socket
+import statistics
+import time
+import urllib.error
+import urllib.request
+
+import uvicorn
+
+from agent.article_fetch import ArticleFetcher
+
+PAGE = (
+    "<html><head><title>Chip makers rally</title></head><body>"
+    "<nav><ul><li>Home</li><li>World</li></ul></nav>"
+    + "<p>Semiconductor stocks rose after the announcement.</p>" * 200
+    + "</body></html>"
+).encode()
+
+
+class StubServer:
+    """Serves PAGE for every path after a fixed delay, counting requests.
+
+    Runs in its own process so it doesn't compete with the fetches for the
+    GIL.
+    """
+
+    def __init__(self, port: int, latency: float):
+        self.port = port
+        self.latency = latency
+        self._requests = multiprocessing.Value("i", 0)
+        self._process = multiprocessing.Process(target=self._serve, daemon=True)
+
+    @property
+    def requests(self) -> int:
+        return self._requests.value
+
+    async def app(self, scope, receive, send):
+        with self._requests.get_lock():
+            self._requests.value += 1
+        await asyncio.sleep(self.latency)
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [(b"content-type", b"text/html; charset=utf-8")],
+        })
+        await send({"type": "http.response.body", "body": PAGE})
+
+    def _serve(self):
+        uvicorn.run(
+            self.app,
+            port=self.port,
+            interface="asgi3",
+            lifespan="off",
+            log_level="warning",
+            backlog=4096,
+        )
+
+    def start(self):
+        self._process.start()
+        while True:
+            try:
+                socket.create_connection(("127.0.0.1", self.port)).close()
+                return
+            except OSError:
+                time.sleep(0.05)
+
+    def stop(self):
+        self._process.terminate()
+        self._process.join()
+
+
+def fetch_blocking(article_url: str) -> str:
+    """The urllib implementation get_news_article used before."""
+    try:
+        with urllib.request.urlopen(article_url) as response:
+            return response.read().decode("utf-8")
+    except urllib.error.URLError as e:
+        return f"Error fetching article: {e}"
+
+
+async def _watch_loop(stop: asyncio.Event, interval: float = 0.005) -> float:
+    """Returns the longest delay past `interval` the loop took to wake up."""
+    worst = 0.0
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        worst = max(worst, time.perf_counter() - start - interval)
+    return worst
+
+
+async def run(mode: str, base_url: str, sessions: int) -> dict:
+    fetcher = ArticleFetcher(fresh_seconds=0) if mode != "blocking" else None
+    latencies = []
+
+    async def session(i: int):
+        url = f"{base_url}/article" if mode == "coalesced" else f"{base_url}/article/{i}"
+        # Sessions all arrive at `start`, so time spent queued counts too.
+        if fetcher is None:
+            fetch_blocking(url)
+        else:
+            await fetcher.fetch(url)
+        latencies.append(time.perf_counter() - start)
+
+    stop = asyncio.Event()
+    watcher = asyncio.ensure_future(_watch_loop(stop))
+    await asyncio.sleep(0)
+    start = time.perf_counter()
+    await asyncio.gather(*(session(i) for i in range(sessions)))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    max_stall = await watcher
+    latencies.sort()
+    return {
+        "elapsed_s": elapsed,
+        "p50_ms": 1000 * statistics.median(latencies),
+        "p99_ms": 1000 * latencies[int(0.99 * (len(latencies) - 1))],
+        "max_stall_ms": 1000 * max_stall,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=200)
+    parser.add_argument("--latency-ms", type=float, default=100)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--modes", default="blocking,async,coalesced")
+    args = parser.parse_args()
+
+    stub = StubServer(args.port, args.latency_ms / 1000)
+    stub.start()
+    try:
+        for mode in args.modes.split(","):
+            served_before = stub.requests
+            result = asyncio.run(run(mode, f"http://127.0.0.1:{args.port}", args.sessions))
+            print(
+                f"{mode}: {result['elapsed_s']:.2f} s total,"
+                f" p50 {result['p50_ms']:.0f} ms, p99 {result['p99_ms']:.0f} ms,"
+                f" max loop lag {result['max_stall_ms']:.0f} ms,"
+                f" {stub.requests - served_before} upstream requests"
+            )
+    finally:
+        stub.stop()
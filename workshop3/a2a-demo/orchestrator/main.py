@@ -1,26 +1,70 @@
+import startup_profile
+
+# Installed before anything else is imported, so every import is timed.
+profiler = startup_profile.install_if_enabled()
+
+import asyncio
+import contextlib
 import logging
 import os
 from dotenv import load_dotenv
 from fastapi import FastAPI
 from google.adk.cli.fast_api import get_fast_api_app
-import uvicorn
+from serve import serve
 
 
 logger = logging.getLogger(__name__)
 
 load_dotenv()
 
+# Imported after load_dotenv() so the agent modules see .env settings.
+from agent.a2a_clients import a2a_httpx_client
+from agent.a2a_clients import agent_card_cache
+from agent.agent import REMOTE_AGENT_CARD_URLS
+from agent.article_fetch import fetcher
+
 AGENT_DIR = os.path.dirname(os.path.abspath(__file__))
 ALLOWED_ORIGINS = ['*']
-SERVE_WEB_INTERFACE = True
+# APP_ENV=production serves only the API, without the ADK dev UI.
+PRODUCTION = os.getenv("APP_ENV", "development") == "production"
+SERVE_WEB_INTERFACE = not PRODUCTION
+
+
+@contextlib.asynccontextmanager
+async def lifespan(app: FastAPI):
+  # Resolve remote agent cards and open their connections ahead of the first
+  # request, without holding up startup while remote agents cold-start.
+  prefetch = asyncio.create_task(
+      agent_card_cache.prefetch(REMOTE_AGENT_CARD_URLS)
+  )
+  agent_card_cache.start_refresh()
+  yield
+  prefetch.cancel()
+  await agent_card_cache.stop()
+  await a2a_httpx_client.aclose()
+  await fetcher.aclose()
+
 
 app: FastAPI = get_fast_api_app(
     agents_dir=AGENT_DIR,
     allow_origins=ALLOWED_ORIGINS,
     web=SERVE_WEB_INTERFACE,
     a2a=True,
+    lifespan=lifespan,
     port=int(os.environ.get("PORT", 8080)),
 )
 
+
+@app.get("/metrics")
+async def metrics():
+  return {"articles": fetcher.metrics()}
+
+
+if profiler:
+  app = profiler.middleware(app)
+
+
 if __name__ == "__main__":
-  uvicorn.run(app, host="0.0.0.0", port=int(os.environ.get("PORT", 8080)))
+  # Prefer `python serve.py`: this process has already built the app, and
+  # with more than one worker each worker builds its own.
+  serve("main:app")
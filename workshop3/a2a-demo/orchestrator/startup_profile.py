@@ -0,0 +1,129 @@
+"""
+Copyright 2025 Google LLC
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    https://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import builtins
+import collections
+import os
+import sys
+import threading
+import time
+
+
+def _group(module: str) -> str:
+    """Names the distribution a module belongs to, e.g. google.adk."""
+    parts = module.split(".")
+    if parts[0] == "google":
+        return ".".join(parts[: 3 if parts[1:2] == ["cloud"] else 2])
+    return parts[0]
+
+
+def _process_start() -> float:
+    """Returns when this process started, on the time.time() clock."""
+    try:
+        with open("/proc/self/stat") as f:
+            start_ticks = int(f.read().rsplit(")", 1)[1].split()[19])
+        with open("/proc/uptime") as f:
+            uptime = float(f.read().split()[0])
+        return time.time() - uptime + start_ticks / os.sysconf("SC_CLK_TCK")
+    except (OSError, ValueError, IndexError):
+        return time.time()
+
+
+class StartupProfiler:
+    """Measures import cost per package and time to the first request.
+
+    `install` wraps `__import__`, so every module imported afterwards is
+    timed. Time spent importing a module, minus the time spent in the
+    imports it triggers, is charged to its top-level package (google.* is
+    split per library), so the per-package totals add up to the total
+    import time. Install it before
+    any other import to see everything.
+
+    Wrap the ASGI app with `middleware` to log the report, including the
+    time from process start to the first request, when it arrives.
+    """
+
+    def __init__(self):
+        self.process_start = _process_start()
+        self.import_seconds = collections.Counter()
+        self.first_request_seconds = None
+        self._stack = threading.local()
+        self._original_import = None
+
+    def _timed_import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        if not level and not fromlist and name in sys.modules:
+            return self._original_import(name, globals, locals, fromlist, level)
+        package = name
+        if level:
+            package = (globals or {}).get("__package__") or name
+        stack = self._stack.__dict__.setdefault("frames", [])
+        stack.append(0.0)
+        start = time.perf_counter()
+        try:
+            return self._original_import(name, globals, locals, fromlist, level)
+        finally:
+            elapsed = time.perf_counter() - start
+            children = stack.pop()
+            if stack:
+                stack[-1] += elapsed
+            self.import_seconds[_group(package)] += elapsed - children
+
+    def install(self):
+        if self._original_import is None:
+            self._original_import = builtins.__import__
+            builtins.__import__ = self._timed_import
+
+    def uninstall(self):
+        if self._original_import is not None:
+            builtins.__import__ = self._original_import
+            self._original_import = None
+
+    def report(self, top: int = 15) -> str:
+        lines = [
+            f"{seconds * 1000:9.1f} ms  {package}"
+            for package, seconds in self.import_seconds.most_common(top)
+        ]
+        total = sum(self.import_seconds.values())
+        lines.append(f"{total * 1000:9.1f} ms  total import time")
+        if self.first_request_seconds is not None:
+            lines.append(
+                f"{self.first_request_seconds * 1000:9.1f} ms  process start to"
+                " first request"
+            )
+        return "\n".join(lines)
+
+    def middleware(self, app):
+        async def profiled_app(scope, receive, send):
+            if scope["type"] == "http" and self.first_request_seconds is None:
+                self.first_request_seconds = time.time() - self.process_start
+                self.uninstall()
+                # Printed rather than logged: the services don't all
+                # configure logging.
+                print(f"Startup profile:\n{self.report()}", file=sys.stderr)
+            await app(scope, receive, send)
+
+        return profiled_app
+
+
+profiler = StartupProfiler()
+
+
+def install_if_enabled():
+    """Starts profiling when STARTUP_PROFILE=true."""
+    if os.getenv("STARTUP_PROFILE", "false").lower() == "true":
+        profiler.install()
+        return profiler
+    return None
@@ -0,0 +1,77 @@
+"""Measures summarizer throughput in articles/sec.
+
+Summarizes generated news-like articles one at a time:
+
+    python summarize_benchmark.py --articles 500 --sentences 40
+"""
+
+import argparse
+import random
+import statistics
+import time
+
+from agent.summarizer import summarize
+
+SUBJECTS = [
+    "The central bank", "Chip makers", "Shipping companies", "Regulators",
+    "Analysts", "The retailer", "Oil producers", "Investors", "The startup",
+    "Lawmakers",
+]
+VERBS = [
+    "raised", "cut", "warned about", "reported", "expected", "announced",
+    "questioned", "delayed", "approved", "doubled",
+]
+OBJECTS = [
+    "interest rates", "quarterly profits", "supply chain costs",
+    "new export rules", "its full-year forecast", "a merger with a rival",
+    "demand for AI chips", "consumer spending", "fuel prices", "job cuts",
+]
+TAILS = [
+    "on Tuesday.", "after weeks of talks.", "despite the slowdown.",
+    "for the first time since 2019.", "according to people familiar with it.",
+    "as markets closed.",
+]
+
+
+def make_article(rng: random.Random, sentences: int) -> str:
+    return " ".join(
+        f"{rng.choice(SUBJECTS)} {rng.choice(VERBS)} {rng.choice(OBJECTS)}"
+        f" {rng.choice(TAILS)}"
+        for _ in range(sentences)
+    )
+
+
+def bench_single(articles: list[str], max_sentences: int) -> dict:
+    timings = []
+    start = time.perf_counter()
+    for article in articles:
+        t = time.perf_counter()
+        summarize(article, max_sentences)
+        timings.append(time.perf_counter() - t)
+    elapsed = time.perf_counter() - start
+    timings.sort()
+    return {
+        "articles_per_sec": len(articles) / elapsed,
+        "p50_ms": 1000 * statistics.median(timings),
+        "p99_ms": 1000 * timings[int(0.99 * (len(timings) - 1))],
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--articles", type=int, default=500)
+    parser.add_argument("--sentences", type=int, default=40)
+    parser.add_argument("--max-sentences", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    articles = [make_article(rng, args.sentences) for _ in range(args.articles)]
+    # Warms NumPy and the regex caches.
+    summarize(articles[0], args.max_sentences)
+
+    single = bench_single(articles, args.max_sentences)
+    print(
+        f"single: {single['articles_per_sec']:.0f} articles/s,"
+        f" p50 {single['p50_ms']:.2f} ms, p99 {single['p99_ms']:.2f} ms"
+    )
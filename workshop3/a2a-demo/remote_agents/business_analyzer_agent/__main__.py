@@ -14,12 +14,16 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
+import startup_profile
+
+# Installed before anything else is imported, so every import is timed.
+profiler = startup_profile.install_if_enabled()
+
 from a2a.types import AgentCapabilities, AgentSkill, AgentCard
 from a2a.server.request_handlers import DefaultRequestHandler
 from a2a.server.apps import A2AStarletteApplication
-from a2a.server.tasks import InMemoryTaskStore
-from agent import BusinessAnalyzerAgent
 from agent_executor import BusinessAnalyzerAgentExecutor
+from task_store import build_task_store
 import uvicorn
 from dotenv import load_dotenv
 import logging
@@ -31,6 +35,11 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Same as BusinessAnalyzerAgent.SUPPORTED_CONTENT_TYPES, which is not
+# imported here so that CrewAI loads only once the server is up.
+SUPPORTED_CONTENT_TYPES = ["text", "text/plain"]
+PRODUCTION = os.getenv("APP_ENV", "development") == "production"
+
 
 @click.command()
 @click.option("--host", "host", default="0.0.0.0")
@@ -58,21 +67,30 @@ def main(host, port):
             description="Helps with analyzing business impact from a news article",
             url=agent_host_url,
             version="1.0.0",
-            defaultInputModes=BusinessAnalyzerAgent.SUPPORTED_CONTENT_TYPES,
-            defaultOutputModes=BusinessAnalyzerAgent.SUPPORTED_CONTENT_TYPES,
+            defaultInputModes=SUPPORTED_CONTENT_TYPES,
+            defaultOutputModes=SUPPORTED_CONTENT_TYPES,
             capabilities=capabilities,
             skills=[skill],
         )
 
+        agent_executor = BusinessAnalyzerAgentExecutor()
+        # In production the port opens right away and crews are built in the
+        # background; in development a broken agent fails startup instead.
+        agent_executor.warm(background=PRODUCTION)
+
         request_handler = DefaultRequestHandler(
-            agent_executor=BusinessAnalyzerAgentExecutor(),
-            task_store=InMemoryTaskStore(),
+            agent_executor=agent_executor,
+            task_store=build_task_store(),
         )
         server = A2AStarletteApplication(
             agent_card=agent_card, http_handler=request_handler
         )
 
-        uvicorn.run(server.build(), host=host, port=port)
+        app = server.build()
+        if profiler:
+            app = profiler.middleware(app)
+
+        uvicorn.run(app, host=host, port=port)
 
         logger.info(f"Starting server on {host}:{port}")
     except Exception as e:
@@ -14,7 +14,10 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
+from contextlib import contextmanager
 from pydantic import BaseModel
+import queue
+import threading
 import uuid
 from crewai import Agent, Crew, LLM, Task, Process
 from crewai.tools import tool
@@ -22,11 +25,39 @@ from dotenv import load_dotenv
 import litellm
 import os
 
+try:
+    from crewai.events import crewai_event_bus, LLMStreamChunkEvent
+except ImportError:  # crewai < 0.150
+    from crewai.utilities.events import crewai_event_bus
+    from crewai.utilities.events.llm_events import LLMStreamChunkEvent
+
 load_dotenv()
 
 litellm.vertex_project = os.getenv("GOOGLE_CLOUD_PROJECT")
 litellm.vertex_location = os.getenv("GOOGLE_CLOUD_LOCATION")
 
+STREAMING_ENABLED = os.getenv("BUSINESS_AGENT_STREAMING", "true").lower() == "true"
+
+# Progress listeners for in-flight runs. Token chunks are emitted on the
+# global CrewAI event bus with the LLM as source, so they are routed by LLM
+# instance; tool calls run on the thread driving the crew, so the listener
+# for the current run is also kept in a thread-local.
+_chunk_listeners = {}
+_run_listener = threading.local()
+
+
+@crewai_event_bus.on(LLMStreamChunkEvent)
+def _forward_stream_chunk(source, event):
+    listener = _chunk_listeners.get(id(source))
+    if listener is not None:
+        listener("token", event.chunk)
+
+
+def _emit_progress(kind, payload):
+    listener = getattr(_run_listener, "callback", None)
+    if listener is not None:
+        listener(kind, payload)
+
 
 class ImpactedBusinessArea(BaseModel):
     area_name: str
@@ -53,8 +84,13 @@ def analyze_business_impact(impacted_areas: list[ImpactedBusinessArea]) -> str:
     """
     try:
         report_id = str(uuid.uuid4())
+        areas = []
+        for impacted_area in impacted_areas:
+            area = ImpactedBusinessArea.model_validate(impacted_area)
+            areas.append(area)
+            _emit_progress("area", area.model_dump())
         report = BusinessImpactReport(
-            report_id=report_id, status="created", impacted_areas=impacted_areas
+            report_id=report_id, status="created", impacted_areas=areas
         )
         print("===")
         print(f"report created: {report}")
@@ -92,9 +128,18 @@ Session ID: {session_id}
 """
     SUPPORTED_CONTENT_TYPES = ["text", "text/plain"]
 
-    def invoke(self, query, sessionId) -> str:
+    def __init__(self, pool_size=None):
+        # Crews are stateful while running (task interpolation, agent tool
+        # handlers), so each one is checked out exclusively. Each crew also
+        # owns its LLM so streamed tokens can be attributed to the run that
+        # produced them.
+        self.pool_size = int(pool_size or os.getenv("BUSINESS_AGENT_CREW_POOL_SIZE", 4))
+        self._crews = queue.LifoQueue()
+
+    def _build_crew(self) -> Crew:
         model = LLM(
             model="vertex_ai/gemini-2.5-flash-lite",  # Use base model name without provider prefix
+            stream=STREAMING_ENABLED,
         )
         business_analyzer_agent = Agent(
             role="Business Analyzer Agent",
@@ -114,15 +159,52 @@ Session ID: {session_id}
             expected_output="A structured business impact analysis report.",
         )
 
-        crew = Crew(
+        return Crew(
             tasks=[analysis_task],
             agents=[business_analyzer_agent],
             verbose=False,
             process=Process.sequential,
         )
 
+    def warm(self, size=None):
+        """Prebuilds crews so the first requests do not pay construction cost."""
+        for _ in range(max(0, (size or self.pool_size) - self._crews.qsize())):
+            self._crews.put(self._build_crew())
+
+    @contextmanager
+    def _checkout(self):
+        try:
+            crew = self._crews.get_nowait()
+        except queue.Empty:
+            # Pool exhausted: build one for this request rather than wait.
+            crew = self._build_crew()
+        try:
+            yield crew
+        finally:
+            if self._crews.qsize() < self.pool_size:
+                self._crews.put(crew)
+
+    def invoke(self, query, sessionId, on_progress=None) -> str:
+        """Runs the crew for one request.
+
+        Args:
+            query: The user query containing the news article.
+            sessionId: The session the request belongs to.
+            on_progress: Optional callable receiving ("token", str) for each
+                streamed LLM chunk and ("area", dict) for each impacted
+                business area, called from the thread running the crew.
+        """
         inputs = {"user_prompt": query, "session_id": sessionId}
-        response = crew.kickoff(inputs)
+        with self._checkout() as crew:
+            model_key = id(crew.agents[0].llm)
+            if on_progress is not None:
+                _chunk_listeners[model_key] = on_progress
+                _run_listener.callback = on_progress
+            try:
+                response = crew.kickoff(inputs)
+            finally:
+                _chunk_listeners.pop(model_key, None)
+                _run_listener.callback = None
         return response
 
 
@@ -14,27 +14,167 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
+import asyncio
+import logging
+import os
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+
 from a2a.server.agent_execution import AgentExecutor, RequestContext
 from a2a.server.events import EventQueue
+from a2a.server.tasks import TaskUpdater
 from a2a.types import (
+    DataPart,
     Part,
     Task,
+    TaskState,
     TextPart,
     UnsupportedOperationError,
 )
 from a2a.utils import (
-    completed_task,
-    new_artifact,
+    new_agent_text_message,
+    new_task,
 )
 from a2a.utils.errors import ServerError
-from agent import BusinessAnalyzerAgent
+
+logger = logging.getLogger(__name__)
+
+# Streamed tokens are flushed once this many characters are buffered, or as
+# soon as no further chunks are waiting.
+STREAM_CHUNK_CHARS = 64
+
+# Agent instance used by worker processes when running with a process pool.
+_process_agent = None
+
+
+def _init_process_worker():
+    global _process_agent
+    from agent import BusinessAnalyzerAgent
+
+    # Each worker process runs one crew at a time.
+    _process_agent = BusinessAnalyzerAgent(pool_size=1)
+    _process_agent.warm()
+
+
+def _invoke_in_process(query, session_id) -> str:
+    # CrewOutput is not guaranteed to be picklable, so hand back plain text.
+    return str(_process_agent.invoke(query, session_id))
 
 
 class BusinessAnalyzerAgentExecutor(AgentExecutor):
-    """Business Analyzer AgentExecutor."""
+    """Business Analyzer AgentExecutor.
+
+    CrewAI runs are synchronous, so they are dispatched to a bounded worker
+    pool instead of the event loop. At most `max_workers` runs are in flight
+    and at most `max_queue_depth` more may wait for a worker; anything beyond
+    that is rejected immediately so callers can back off or retry elsewhere.
+    """
+
+    def __init__(
+        self,
+        pool_type=None,
+        max_workers=None,
+        max_queue_depth=None,
+        task_timeout=None,
+    ):
+        self.pool_type = pool_type or os.getenv("BUSINESS_AGENT_POOL", "thread")
+        self.max_workers = int(
+            max_workers or os.getenv("BUSINESS_AGENT_MAX_WORKERS", 4)
+        )
+        self.max_queue_depth = int(
+            max_queue_depth
+            if max_queue_depth is not None
+            else os.getenv("BUSINESS_AGENT_MAX_QUEUE_DEPTH", 16)
+        )
+        self.task_timeout = float(
+            task_timeout or os.getenv("BUSINESS_AGENT_TASK_TIMEOUT", 300)
+        )
+        # Built on first use: importing CrewAI takes seconds, so the server
+        # can start listening before it is done.
+        self._agent = None
+        self._agent_lock = threading.Lock()
+        # Cleared while crews are built in the background; runs wait for it
+        # so they take a warm crew instead of building their own.
+        self._warmed = threading.Event()
+        self._warmed.set()
+        self._pool = self._create_pool()
+        # Counts runs that are queued or running. A run only releases its
+        # slot once the worker returns, even if the caller already timed out,
+        # so the pool can never be oversubscribed by abandoned runs.
+        self._pending = 0
+        self._pending_lock = threading.Lock()
+
+    def _create_pool(self) -> Executor:
+        if self.pool_type == "process":
+            return ProcessPoolExecutor(
+                max_workers=self.max_workers, initializer=_init_process_worker
+            )
+        if self.pool_type != "thread":
+            raise ValueError(f"Unsupported pool type: {self.pool_type}")
+        return ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="business-analyzer"
+        )
+
+    @property
+    def agent(self):
+        with self._agent_lock:
+            if self._agent is None:
+                from agent import BusinessAnalyzerAgent
+
+                # One prebuilt crew per worker thread, so no run has to build
+                # its own.
+                self._agent = BusinessAnalyzerAgent(pool_size=self.max_workers)
+            return self._agent
+
+    def warm(self, background=False):
+        """Prebuilds crews ahead of the first request.
+
+        With `background`, this returns at once and the crews are built on
+        a separate thread; a run starting earlier waits for them.
+        """
+        if self.pool_type == "process":
+            # Worker processes warm their own agents in the pool initializer;
+            # submitting no-op work makes them start up now.
+            for _ in range(self.max_workers):
+                self._pool.submit(int)
+        elif background:
+            self._warmed.clear()
+            threading.Thread(target=self._warm_agent, name="warm", daemon=True).start()
+        else:
+            self.agent.warm()
+
+    def _warm_agent(self):
+        try:
+            self.agent.warm()
+        except Exception:
+            logger.exception("Background warm-up failed")
+        finally:
+            self._warmed.set()
+
+    def _invoke(self, query, session_id, on_progress):
+        self._warmed.wait()
+        return self.agent.invoke(query, session_id, on_progress)
 
-    def __init__(self):
-        self.agent = BusinessAnalyzerAgent()
+    def _try_acquire(self) -> bool:
+        with self._pending_lock:
+            if self._pending >= self.max_workers + self.max_queue_depth:
+                return False
+            self._pending += 1
+            return True
+
+    def _release(self, _future=None):
+        with self._pending_lock:
+            self._pending -= 1
+
+    def _submit(self, query, session_id, on_progress=None):
+        if self.pool_type == "process":
+            # Progress callbacks cannot cross the process boundary, so process
+            # workers only report the final result.
+            future = self._pool.submit(_invoke_in_process, query, session_id)
+        else:
+            future = self._pool.submit(self._invoke, query, session_id, on_progress)
+        future.add_done_callback(self._release)
+        return asyncio.wrap_future(future)
 
     async def execute(
         self,
@@ -42,24 +182,126 @@ class BusinessAnalyzerAgentExecutor(AgentExecutor):
         event_queue: EventQueue,
     ) -> None:
         query = context.get_user_input()
+        task = context.current_task or new_task(context.message)
+        await event_queue.enqueue_event(task)
+        updater = TaskUpdater(event_queue, task.id, task.context_id)
+
+        if not self._try_acquire():
+            logger.warning(
+                "Rejecting task %s: %d runs already pending",
+                task.id,
+                self._pending,
+            )
+            await updater.update_status(
+                TaskState.rejected,
+                new_agent_text_message(
+                    "The business analyzer is at capacity, please retry later.",
+                    task.context_id,
+                    task.id,
+                ),
+                final=True,
+            )
+            return
+
+        # The crew reports progress from its worker thread; hop each event
+        # onto the loop in order and drain them here while it runs.
+        loop = asyncio.get_running_loop()
+        progress = asyncio.Queue()
+
+        def on_progress(kind, payload):
+            loop.call_soon_threadsafe(progress.put_nowait, (kind, payload))
+
+        run = asyncio.ensure_future(
+            asyncio.wait_for(
+                self._submit(query, task.context_id, on_progress),
+                self.task_timeout,
+            )
+        )
+        run.add_done_callback(lambda _: progress.put_nowait(None))
+
         try:
-            result = self.agent.invoke(query, context.context_id)
-            print(f"Final Result ===> {result}")
-
-            parts = [Part(root=TextPart(text=str(result)))]
-            await event_queue.enqueue_event(
-                completed_task(
-                    context.task_id,
-                    context.context_id,
-                    [new_artifact(parts, f"business_analysis_{context.task_id}")],
-                    [context.message],
-                )
+            await updater.update_status(
+                TaskState.working,
+                new_agent_text_message(
+                    "Analyzing business impact...", task.context_id, task.id
+                ),
+            )
+            await self._stream_progress(progress, updater, task)
+            result = await run
+            logger.debug("Task %s result: %s", task.id, result)
+
+            await updater.add_artifact(
+                [Part(root=TextPart(text=str(result)))],
+                name=f"business_analysis_{task.id}",
+            )
+            await updater.complete()
+        except asyncio.TimeoutError:
+            logger.warning("Task %s timed out after %ss", task.id, self.task_timeout)
+            await updater.update_status(
+                TaskState.failed,
+                new_agent_text_message(
+                    f"Agent run timed out after {self.task_timeout}s",
+                    task.context_id,
+                    task.id,
+                ),
+                final=True,
             )
         except Exception as e:
-            print("Error invoking agent: %s", e)
-            raise ServerError(error=ValueError(f"Error invoking agent: {e}")) from e
+            logger.exception("Error invoking agent for task %s", task.id)
+            await updater.update_status(
+                TaskState.failed,
+                new_agent_text_message(
+                    f"Error invoking agent: {e}", task.context_id, task.id
+                ),
+                final=True,
+            )
+
+    async def _stream_progress(self, progress, updater, task):
+        """Forwards crew progress as it arrives until the run finishes.
+
+        Tokens are appended to a single streaming artifact; chunks that are
+        already queued are coalesced into one update. Each impacted business
+        area is reported as a status update and appended as structured data.
+        """
+        stream_id = f"business_analysis_stream_{task.id}"
+        areas_id = f"impacted_areas_{task.id}"
+        pending_text = ""
+        while (item := await progress.get()) is not None:
+            kind, payload = item
+            if kind == "token":
+                pending_text += payload
+                if progress.empty() or len(pending_text) >= STREAM_CHUNK_CHARS:
+                    await updater.add_artifact(
+                        [Part(root=TextPart(text=pending_text))],
+                        artifact_id=stream_id,
+                        name="business_analysis_stream",
+                        append=True,
+                    )
+                    pending_text = ""
+            elif kind == "area":
+                await updater.update_status(
+                    TaskState.working,
+                    new_agent_text_message(
+                        f"Impact on {payload['area_name']}: {payload['impact_level']}",
+                        task.context_id,
+                        task.id,
+                    ),
+                )
+                await updater.add_artifact(
+                    [Part(root=DataPart(data=payload))],
+                    artifact_id=areas_id,
+                    name="impacted_areas",
+                    append=True,
+                )
+        if pending_text:
+            await updater.add_artifact(
+                [Part(root=TextPart(text=pending_text))],
+                artifact_id=stream_id,
+                name="business_analysis_stream",
+                append=True,
+            )
 
     async def cancel(
         self, request: RequestContext, event_queue: EventQueue
     ) -> Task | None:
-        raise ServerError(error=UnsupportedOperationError())
\ No newline at end of file
+        raise ServerError(error=UnsupportedOperationError())
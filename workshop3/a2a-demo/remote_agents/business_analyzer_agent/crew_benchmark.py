@@ -0,0 +1,49 @@
+"""Compares building a crew per request with checking one out of the pool.
+
+Neither path calls the model, so no credentials are needed:
+
+    python crew_benchmark.py --iterations 200
+"""
+
+import argparse
+import statistics
+import time
+
+from agent import BusinessAnalyzerAgent
+
+
+def _measure(func, iterations: int) -> dict:
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+    return {
+        "mean_ms": 1000 * statistics.fmean(timings),
+        "p50_ms": 1000 * statistics.median(timings),
+        "p99_ms": 1000 * timings[int(0.99 * (len(timings) - 1))],
+    }
+
+
+def _checkout(agent: BusinessAnalyzerAgent):
+    with agent._checkout():
+        pass
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    agent = BusinessAnalyzerAgent(pool_size=1)
+    # The first build also pays one-off import and validation costs.
+    agent._build_crew()
+    results = {"build per request": _measure(agent._build_crew, args.iterations)}
+    agent.warm()
+    results["pooled checkout"] = _measure(lambda: _checkout(agent), args.iterations)
+    for name, stats in results.items():
+        print(
+            f"{name}: mean {stats['mean_ms']:.3f} ms,"
+            f" p50 {stats['p50_ms']:.3f} ms, p99 {stats['p99_ms']:.3f} ms"
+        )
@@ -0,0 +1,120 @@
+"""Measures business analyzer task throughput at several worker pool sizes.
+
+Runs the agent executor in-process and drives `--tasks` concurrent A2A
+tasks through `execute()` for each pool size, e.g.:
+
+    python loadtest.py --pool-sizes 1,2,4,8 --tasks 32
+
+By default each crew run is simulated: it blocks its worker thread for
+`--crew-seconds` (the crew mostly waits on the LLM) and streams a few
+tokens, so the numbers show how the pool schedules runs without calling a
+model. Pass `--real` to run the actual crews, which needs Vertex AI
+credentials in the environment.
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+
+from a2a.server.agent_execution import RequestContext
+from a2a.server.events import EventQueue
+from a2a.types import (
+    Message,
+    MessageSendParams,
+    Part,
+    Role,
+    TaskState,
+    TaskStatusUpdateEvent,
+    TextPart,
+)
+from agent_executor import BusinessAnalyzerAgentExecutor
+
+ARTICLE = (
+    "A new AI breakthrough promises to double chip performance, potentially"
+    " disrupting the entire semiconductor industry."
+)
+
+
+def _simulated_invoke(crew_seconds: float):
+    def invoke(query, session_id, on_progress):
+        for word in ("Analyzing ", "business ", "impact..."):
+            if on_progress is not None:
+                on_progress("token", word)
+            time.sleep(crew_seconds / 3)
+        return f"Simulated analysis for session {session_id}"
+
+    return invoke
+
+
+async def _run_task(executor, latencies, states):
+    message = Message(
+        role=Role.user,
+        parts=[Part(root=TextPart(text=ARTICLE))],
+        message_id=uuid.uuid4().hex,
+    )
+    context = RequestContext(request=MessageSendParams(message=message))
+    event_queue = EventQueue()
+    final_state = None
+
+    async def drain():
+        nonlocal final_state
+        while True:
+            event = await event_queue.dequeue_event()
+            event_queue.task_done()
+            if isinstance(event, TaskStatusUpdateEvent) and event.final:
+                final_state = event.status.state
+                return
+
+    start = time.perf_counter()
+    drainer = asyncio.ensure_future(drain())
+    await executor.execute(context, event_queue)
+    await drainer
+    if final_state == TaskState.completed:
+        latencies.append(time.perf_counter() - start)
+    states.append(final_state)
+
+
+async def run(pool_size: int, tasks: int, queue_depth: int, crew_seconds: float, real: bool) -> dict:
+    executor = BusinessAnalyzerAgentExecutor(
+        max_workers=pool_size, max_queue_depth=queue_depth
+    )
+    if real:
+        executor.warm()
+    else:
+        executor._invoke = _simulated_invoke(crew_seconds)
+    latencies, states = [], []
+    start = time.perf_counter()
+    await asyncio.gather(*(_run_task(executor, latencies, states) for _ in range(tasks)))
+    elapsed = time.perf_counter() - start
+    executor._pool.shutdown()
+    latencies.sort()
+    return {
+        "tasks_per_sec": len(latencies) / elapsed,
+        "completed": len(latencies),
+        "rejected": states.count(TaskState.rejected),
+        "failed": states.count(TaskState.failed),
+        "p50_s": statistics.median(latencies) if latencies else 0.0,
+        "p99_s": latencies[int(0.99 * (len(latencies) - 1))] if latencies else 0.0,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pool-sizes", default="1,2,4,8")
+    parser.add_argument("--tasks", type=int, default=32)
+    parser.add_argument("--queue-depth", type=int, default=64)
+    parser.add_argument("--crew-seconds", type=float, default=1.0)
+    parser.add_argument("--real", action="store_true")
+    args = parser.parse_args()
+    for pool_size in (int(size) for size in args.pool_sizes.split(",")):
+        result = asyncio.run(
+            run(pool_size, args.tasks, args.queue_depth, args.crew_seconds, args.real)
+        )
+        print(
+            f"workers={pool_size}: {result['tasks_per_sec']:.2f} tasks/s,"
+            f" {result['completed']} completed, {result['rejected']} rejected,"
+            f" {result['failed']} failed,"
+            f" p50 {result['p50_s']:.2f} s, p99 {result['p99_s']:.2f} s"
+        )
@@ -14,12 +14,24 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
+import startup_profile
+
+# Installed before anything else is imported, so every import is timed.
+profiler = startup_profile.install_if_enabled()
+
 from a2a.types import AgentCapabilities, AgentSkill, AgentCard
 from a2a.server.request_handlers import DefaultRequestHandler
 from a2a.server.apps import A2AStarletteApplication
-from a2a.server.tasks import InMemoryTaskStore
 from agent import root_agent
+from article_fetch import fetcher
+from batch import BatchSentimentScorer
+from response_cache import response_cache
+from sentiment_lexicon import LexiconSentimentScorer
 from agent_executor import ADKAgentExecutor
+from session_store import BoundedInMemorySessionService
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from task_store import build_task_store
 import uvicorn
 from dotenv import load_dotenv
 import logging
@@ -27,7 +39,6 @@ import os
 import click
 from google.adk.runners import Runner
 from google.adk.memory.in_memory_memory_service import InMemoryMemoryService
-from google.adk.sessions import InMemorySessionService
 
 load_dotenv()
 
@@ -52,6 +63,20 @@ def main(host, port):
                 "Analyze the sentiment of this article: <article text>"
             ],
         )
+        batch_skill = AgentSkill(
+            id="batch_analyze_sentiment",
+            name="Batch Sentiment Analysis Tool",
+            description=(
+                "Analyzes the sentiment of many news articles at once. Send a"
+                ' data part {"articles": [...]} whose items are URLs, article'
+                ' texts or {"id", "url" | "text"} objects; one result per'
+                " article is streamed back as it completes."
+            ),
+            tags=["sentiment analysis", "batch"],
+            examples=['{"articles": ["https://example.com/a", "https://example.com/b"]}'],
+            inputModes=["application/json"],
+            outputModes=["application/json"],
+        )
         agent_host_url = (
             os.getenv("HOST_OVERRIDE")
             if os.getenv("HOST_OVERRIDE")
@@ -65,25 +90,58 @@ def main(host, port):
             defaultInputModes=["text"],
             defaultOutputModes=["text"],
             capabilities=capabilities,
-            skills=[skill],
+            skills=[skill, batch_skill],
         )
 
+        session_service = BoundedInMemorySessionService(
+            max_sessions=int(os.getenv("SESSION_MAX_COUNT", 10000)),
+            idle_ttl=float(os.getenv("SESSION_IDLE_TTL_SECONDS", 3600)),
+        )
+        fast_scorer = None
+        if os.getenv("SENTIMENT_FAST_PATH", "true").lower() == "true":
+            fast_scorer = LexiconSentimentScorer(
+                threshold=float(os.getenv("SENTIMENT_FAST_PATH_THRESHOLD", 0.6)),
+            )
         runner = Runner(
             agent=root_agent,
             memory_service=InMemoryMemoryService(),
-            session_service=InMemorySessionService(),
+            session_service=session_service,
             app_name="sentiment_analyzer_agent",
         )
 
         request_handler = DefaultRequestHandler(
-            agent_executor=ADKAgentExecutor(runner=runner, agent_card=agent_card),
-            task_store=InMemoryTaskStore(),
+            agent_executor=ADKAgentExecutor(
+                runner=runner,
+                agent_card=agent_card,
+                batch_scorer=BatchSentimentScorer(
+                    articles_per_call=int(os.getenv("SENTIMENT_BATCH_SIZE", 8)),
+                ),
+                fast_scorer=fast_scorer,
+            ),
+            task_store=build_task_store(),
         )
         server = A2AStarletteApplication(
             agent_card=agent_card, http_handler=request_handler
         )
 
-        uvicorn.run(server.build(), host=host, port=run_port)
+        app = server.build()
+
+        async def metrics(request: Request) -> JSONResponse:
+            return JSONResponse(
+                {
+                    "sessions": session_service.metrics(),
+                    "articles": fetcher.metrics(),
+                    "fast_path": fast_scorer.metrics() if fast_scorer else {},
+                    "response_cache": response_cache.metrics(),
+                }
+            )
+
+        app.add_route("/metrics", metrics, methods=["GET"])
+        app.add_event_handler("shutdown", fetcher.aclose)
+        if profiler:
+            app = profiler.middleware(app)
+
+        uvicorn.run(app, host=host, port=run_port)
 
         logger.info(f"Starting server on {host}:{run_port}")
     except Exception as e:
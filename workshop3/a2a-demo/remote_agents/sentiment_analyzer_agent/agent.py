@@ -13,20 +13,20 @@
 # limitations under the License.
 
 import os
-import urllib.error
-import urllib.request
 
+import httpx
+from article_fetch import fetcher
 from google.adk.agents import Agent
 from google.adk.tools.tool_context import ToolContext
 from google.genai import types
+from response_cache import response_cache
 
 
-def get_news_article(article_url: str) -> str:
+async def get_news_article(article_url: str) -> str:
   """Get a news article from a URL."""
   try:
-    with urllib.request.urlopen(article_url) as response:
-      return response.read().decode('utf-8')
-  except urllib.error.URLError as e:
+    return await fetcher.fetch(article_url)
+  except httpx.HTTPError as e:
     return f'Error fetching article: {e}'
 
 
@@ -48,7 +48,11 @@ root_agent = Agent(
     #         include_thoughts=True,
     #     ),
     # ),
+    # Deterministic output makes the answers safe to cache.
+    before_model_callback=response_cache.before_model,
+    after_model_callback=response_cache.after_model,
     generate_content_config=types.GenerateContentConfig(
+        temperature=0.0,
         safety_settings=[
             types.SafetySetting(
                 category=types.HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT,
@@ -1,17 +1,30 @@
+import re
+import time
+import uuid
+
 from a2a.server.agent_execution import AgentExecutor, RequestContext
 from a2a.server.events import EventQueue
 from a2a.server.tasks import TaskUpdater
 from a2a.types import (
+    DataPart,
     Part,
     TaskState,
     TextPart,
 )
 from a2a.utils import new_agent_text_message, new_task
+from article_fetch import fetcher
+from batch import parse_batch_request
+from google.adk.agents.invocation_context import new_invocation_context_id
+from google.adk.agents.run_config import RunConfig, StreamingMode
 from google.adk.artifacts import InMemoryArtifactService
+from google.adk.events import Event
 from google.adk.memory.in_memory_memory_service import InMemoryMemoryService
 from google.adk.runners import Runner
 from google.adk.sessions import InMemorySessionService
 from google.genai import types
+import httpx
+
+_URL = re.compile(r'https?://\S+')
 
 
 class ADKAgentExecutor(AgentExecutor):
@@ -22,6 +35,11 @@ class ADKAgentExecutor(AgentExecutor):
       agent_card,
       status_message='Processing request...',
       artifact_name='response',
+      streaming=True,
+      min_chunk_chars=80,
+      max_chunk_delay=0.25,
+      batch_scorer=None,
+      fast_scorer=None,
   ):
     """Initialize a generic ADK agent executor.
 
@@ -30,11 +48,23 @@ class ADKAgentExecutor(AgentExecutor):
         agent_card: The ADK agent card instance
         status_message: Message to display while processing
         artifact_name: Name for the response artifact
+        streaming: Forward partial model output as artifact chunks
+        min_chunk_chars: Buffered characters that trigger a chunk
+        max_chunk_delay: Seconds after which buffered text is sent anyway
+        batch_scorer: Optional BatchSentimentScorer used for requests that
+          carry an `articles` list instead of going through the runner
+        fast_scorer: Optional LexiconSentimentScorer that answers clearly
+          polar single-article requests before falling back to the runner
     """
     self.runner = runner
     self._card = agent_card
     self.status_message = status_message
     self.artifact_name = artifact_name
+    self.streaming = streaming
+    self.min_chunk_chars = min_chunk_chars
+    self.max_chunk_delay = max_chunk_delay
+    self.batch_scorer = batch_scorer
+    self.fast_scorer = fast_scorer
 
   async def cancel(
       self,
@@ -71,36 +101,59 @@ class ADKAgentExecutor(AgentExecutor):
           new_agent_text_message(self.status_message, task.context_id, task.id),
       )
 
-      # Process with ADK agent
-      session = await self.runner.session_service.create_session(
-          app_name=self.runner.agent.name,
-          user_id=user_id,
-          state={},
-          session_id=task.context_id,
-      )
+      articles = self._batch_articles(context)
+      if articles is not None:
+        await self._execute_batch(articles, updater)
+        return
+
+      # Continue the session of an ongoing context
+      session = await self._get_or_create_session(user_id, task.context_id)
+
+      if await self._try_fast_path(query, session, updater):
+        return
 
+      # Process with ADK agent
       content = types.Content(
           role='user', parts=[types.Part.from_text(text=query)]
       )
 
-      response_text = ''
+      run_config = RunConfig(
+          streaming_mode=(
+              StreamingMode.SSE if self.streaming else StreamingMode.NONE
+          )
+      )
+      chunks = _ArtifactChunker(
+          updater,
+          self.artifact_name,
+          self.min_chunk_chars,
+          self.max_chunk_delay,
+      )
+      # Text already streamed as partial events is repeated in the
+      # aggregated event that closes the model turn, so only turns that
+      # produced no partials contribute their final text.
+      streamed_turn = False
       async for event in self.runner.run_async(
-          user_id=user_id, session_id=session.id, new_message=content
+          user_id=user_id,
+          session_id=session.id,
+          new_message=content,
+          run_config=run_config,
       ):
-        if event.is_final_response() and event.content and event.content.parts:
-          for part in event.content.parts:
-            if hasattr(part, 'text') and part.text:
-              response_text += part.text + '\n'
-            elif hasattr(part, 'function_call'):
-              # Log or handle function calls if needed
-              pass  # Function calls are handled internally by ADK
-
-      # Add response as artifact with custom name
-      await updater.add_artifact(
-          [Part(root=TextPart(text=response_text))],
-          name=self.artifact_name,
-      )
+        if not (event.content and event.content.parts):
+          continue
+        text = ''.join(
+            part.text for part in event.content.parts if part.text
+        )
+        if event.partial:
+          if text:
+            streamed_turn = True
+            await chunks.add(text)
+          continue
+        if event.is_final_response() and text and not streamed_turn:
+          await chunks.add(text + '\n')
+        # Function calls and responses are handled internally by ADK.
+        streamed_turn = False
 
+      await chunks.close()
       await updater.complete()
 
     except Exception as e:
@@ -109,3 +162,136 @@ class ADKAgentExecutor(AgentExecutor):
           new_agent_text_message(f'Error: {e!s}', task.context_id, task.id),
           final=True,
       )
+
+  def _batch_articles(self, context: RequestContext):
+    if self.batch_scorer is None:
+      return None
+    for part in context.message.parts:
+      if isinstance(part.root, DataPart):
+        articles = parse_batch_request(part.root.data)
+      elif isinstance(part.root, TextPart):
+        articles = parse_batch_request(part.root.text)
+      else:
+        continue
+      if articles is not None:
+        return articles
+    return None
+
+  async def _get_or_create_session(self, user_id: str, session_id: str):
+    session_service = self.runner.session_service
+    session = await session_service.get_session(
+        app_name=self.runner.app_name,
+        user_id=user_id,
+        session_id=session_id,
+    )
+    if session is None:
+      session = await session_service.create_session(
+          app_name=self.runner.app_name,
+          user_id=user_id,
+          state={},
+          session_id=session_id,
+      )
+    return session
+
+  async def _try_fast_path(
+      self, query: str, session, updater: TaskUpdater
+  ) -> bool:
+    """Answers with the lexicon scorer when it is confident enough.
+
+    The exchange is appended to `session`, so later LLM turns in the same
+    context see it.
+    """
+    if self.fast_scorer is None:
+      return False
+    urls = _URL.findall(query)
+    if len(urls) > 1:
+      return False
+    text = query
+    if urls:
+      # The fetch is cached, so an LLM fallback re-reads it for free.
+      try:
+        text = await fetcher.fetch(urls[0].rstrip('.,)'))
+      except httpx.HTTPError:
+        return False
+    result = self.fast_scorer.classify(text)
+    if result is None:
+      return False
+    answer = (
+        f'The sentiment of the article is {result.label}'
+        f' (confidence {result.confidence:.2f}).'
+    )
+    invocation_id = new_invocation_context_id()
+    for author, role, message in (
+        ('user', 'user', query),
+        (self.runner.agent.name, 'model', answer),
+    ):
+      await self.runner.session_service.append_event(
+          session,
+          Event(
+              invocation_id=invocation_id,
+              author=author,
+              content=types.Content(
+                  role=role, parts=[types.Part.from_text(text=message)]
+              ),
+          ),
+      )
+    await updater.add_artifact(
+        [Part(root=TextPart(text=answer))],
+        name=self.artifact_name,
+    )
+    await updater.complete()
+    return True
+
+  async def _execute_batch(self, articles, updater: TaskUpdater):
+    """Scores a batch of articles, streaming one artifact per article."""
+    async for result in self.batch_scorer.score(articles):
+      await updater.add_artifact(
+          [Part(root=DataPart(data=result))],
+          name=f'sentiment_{result["id"]}',
+      )
+    await updater.complete()
+
+
+class _ArtifactChunker:
+  """Coalesces streamed text into artifact-append updates.
+
+  Text is sent once `min_chars` have accumulated or `max_delay` seconds have
+  passed since the last update, so token-sized events do not each become a
+  separate queue event.
+  """
+
+  def __init__(self, updater, name, min_chars, max_delay):
+    self.updater = updater
+    self.name = name
+    self.min_chars = min_chars
+    self.max_delay = max_delay
+    self.artifact_id = None
+    self.buffer = ''
+    self.last_sent = time.monotonic()
+
+  async def add(self, text):
+    self.buffer += text
+    if (
+        len(self.buffer) >= self.min_chars
+        or time.monotonic() - self.last_sent >= self.max_delay
+    ):
+      await self._send(last_chunk=False)
+
+  async def close(self):
+    await self._send(last_chunk=True)
+
+  async def _send(self, last_chunk):
+    if not self.buffer and not last_chunk:
+      return
+    first_chunk = self.artifact_id is None
+    if first_chunk:
+      self.artifact_id = str(uuid.uuid4())
+    await self.updater.add_artifact(
+        [Part(root=TextPart(text=self.buffer))],
+        artifact_id=self.artifact_id,
+        name=self.name,
+        append=not first_chunk,
+        last_chunk=last_chunk,
+    )
+    self.buffer = ''
+    self.last_sent = time.monotonic()
@@ -0,0 +1,235 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import dataclasses
+import html.parser
+import re
+
+# Subtrees that never contain article text.
+SKIP_TAGS = frozenset({
+    'script', 'style', 'noscript', 'template', 'svg', 'canvas', 'iframe',
+    'nav', 'header', 'footer', 'aside', 'form', 'button', 'select',
+})
+BLOCK_TAGS = frozenset({
+    'p', 'div', 'section', 'article', 'main', 'li', 'ul', 'ol', 'dd', 'dt',
+    'blockquote', 'pre', 'table', 'tr', 'td', 'th', 'br', 'hr', 'figcaption',
+    'h1', 'h2', 'h3', 'h4', 'h5', 'h6',
+})
+CONTENT_TAGS = frozenset({'article', 'main'})
+# Tags whose class/id are never used to classify boilerplate.
+UNFILTERED_TAGS = CONTENT_TAGS | {'html', 'body'}
+VOID_TAGS = frozenset({
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link',
+    'meta', 'param', 'source', 'track', 'wbr',
+})
+# class/id fragments that mark page chrome rather than content.
+BOILERPLATE_HINTS = re.compile(
+    r'nav|menu|footer|sidebar|comment|cookie|advert|promo|share|social|'
+    r'related|subscribe|newsletter|breadcrumb|banner|popup',
+    re.IGNORECASE,
+)
+_WHITESPACE = re.compile(r'\s+')
+_SENTENCE_END = re.compile(r'[.!?]["\')\]]?\s')
+
+# Rough characters-per-token ratio for English text with Gemini tokenizers.
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+  return -(-len(text) // CHARS_PER_TOKEN)
+
+
+@dataclasses.dataclass
+class _Block:
+  text: str
+  link_chars: int
+  in_content: bool
+  heading: bool
+
+
+@dataclasses.dataclass
+class ExtractedArticle:
+  text: str
+  bytes_in: int
+  tokens_out: int
+  truncated: bool
+
+
+class ArticleExtractor(html.parser.HTMLParser):
+  """Incrementally turns article HTML into plain text.
+
+  Feed decoded chunks as they arrive with `feed_chunk` and call `finish` once
+  the body is complete. Scripts, styles and page chrome (navigation, headers,
+  footers, and elements whose class or id looks like ads or menus) are
+  dropped while parsing. The remaining text blocks are reduced to the main
+  content: blocks inside <article>/<main> when those hold enough text,
+  otherwise blocks that are not dominated by links.
+  """
+
+  MIN_CONTENT_CHARS = 200
+
+  def __init__(self):
+    super().__init__(convert_charrefs=True)
+    self.bytes_in = 0
+    self._blocks = []
+    self._parts = []
+    self._link_chars = 0
+    # Tag that opened the subtree being skipped, and how many elements with
+    # that name are open in it. Only that name is counted: other tags are
+    # often left unclosed (<li>, <p>) and would never bring the depth back
+    # to zero.
+    self._skip_tag = None
+    self._skip_depth = 0
+    self._content_depth = 0
+    self._link_depth = 0
+    self._heading_depth = 0
+    self._in_title = False
+    self._title = ''
+
+  def feed_chunk(self, chunk: str, raw_size: int):
+    self.bytes_in += raw_size
+    self.feed(chunk)
+
+  def _flush(self):
+    text = _WHITESPACE.sub(' ', ''.join(self._parts)).strip()
+    if text:
+      self._blocks.append(
+          _Block(
+              text=text,
+              link_chars=self._link_chars,
+              in_content=self._content_depth > 0,
+              heading=self._heading_depth > 0,
+          )
+      )
+    self._parts = []
+    self._link_chars = 0
+
+  def handle_starttag(self, tag, attrs):
+    if self._skip_tag:
+      if tag == self._skip_tag:
+        self._skip_depth += 1
+      return
+    hints = ' '.join(v for k, v in attrs if k in ('class', 'id') and v)
+    if tag in SKIP_TAGS or (
+        tag not in UNFILTERED_TAGS
+        and hints
+        and BOILERPLATE_HINTS.search(hints)
+    ):
+      if tag not in VOID_TAGS:
+        self._flush()
+        self._skip_tag = tag
+        self._skip_depth = 1
+      return
+    if tag == 'title':
+      self._in_title = True
+    if tag in BLOCK_TAGS:
+      self._flush()
+    if tag in CONTENT_TAGS:
+      self._content_depth += 1
+    elif tag == 'a':
+      self._link_depth += 1
+    elif tag in ('h1', 'h2', 'h3', 'h4', 'h5', 'h6'):
+      self._heading_depth += 1
+
+  def handle_endtag(self, tag):
+    if self._skip_tag:
+      if tag == self._skip_tag:
+        self._skip_depth -= 1
+        if not self._skip_depth:
+          self._skip_tag = None
+      return
+    if tag == 'title':
+      self._in_title = False
+    if tag in BLOCK_TAGS:
+      self._flush()
+    if tag in CONTENT_TAGS:
+      self._content_depth = max(0, self._content_depth - 1)
+    elif tag == 'a':
+      self._link_depth = max(0, self._link_depth - 1)
+    elif tag in ('h1', 'h2', 'h3', 'h4', 'h5', 'h6'):
+      self._heading_depth = max(0, self._heading_depth - 1)
+
+  def handle_data(self, data):
+    if self._skip_tag:
+      return
+    if self._in_title:
+      self._title += data
+      return
+    self._parts.append(data)
+    if self._link_depth:
+      self._link_chars += len(data.strip())
+
+  def _main_blocks(self) -> list[_Block]:
+    content = [b for b in self._blocks if b.in_content]
+    if sum(len(b.text) for b in content) >= self.MIN_CONTENT_CHARS:
+      return content
+    return [
+        b
+        for b in self._blocks
+        if b.heading
+        or (len(b.text.split()) >= 5 and b.link_chars < 0.5 * len(b.text))
+    ]
+
+  def finish(self, token_budget: int) -> ExtractedArticle:
+    """Completes parsing and returns the main text within `token_budget`."""
+    self.close()
+    self._flush()
+    lines = []
+    title = _WHITESPACE.sub(' ', self._title).strip()
+    if title:
+      lines.append(title)
+    for block in self._main_blocks():
+      if not lines or block.text != lines[-1]:
+        lines.append(block.text)
+    text, truncated = truncate_to_budget(lines, token_budget)
+    return ExtractedArticle(
+        text=text,
+        bytes_in=self.bytes_in,
+        tokens_out=estimate_tokens(text),
+        truncated=truncated,
+    )
+
+
+def truncate_to_budget(lines: list[str], token_budget: int) -> tuple[str, bool]:
+  """Joins whole lines until the budget is reached.
+
+  A line that does not fit is cut at its last sentence boundary within the
+  remaining budget, or at a word boundary if it has none, so the text never
+  ends mid-word.
+  """
+  budget_chars = token_budget * CHARS_PER_TOKEN
+  kept = []
+  used = 0
+  for line in lines:
+    cost = len(line) + 1
+    if used + cost <= budget_chars:
+      kept.append(line)
+      used += cost
+      continue
+    remaining = line[: max(0, budget_chars - used)]
+    ends = list(_SENTENCE_END.finditer(remaining + ' '))
+    if ends:
+      kept.append(remaining[: ends[-1].end()].rstrip())
+    elif ' ' in remaining:
+      kept.append(remaining.rsplit(' ', 1)[0] + ' ...')
+    kept.append('[truncated]')
+    return '\n'.join(kept), True
+  return '\n'.join(kept), False
+
+
+def extract_text(raw: str, token_budget: int) -> ExtractedArticle:
+  """Extracts the main text from a complete HTML document."""
+  extractor = ArticleExtractor()
+  extractor.feed_chunk(raw, len(raw.encode('utf-8')))
+  return extractor.finish(token_budget)
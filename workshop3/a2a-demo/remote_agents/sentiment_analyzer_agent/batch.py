@@ -0,0 +1,179 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import json
+import logging
+from typing import Any, AsyncIterator, Literal
+
+from article_fetch import fetcher
+from google import genai
+from google.genai import types
+import httpx
+from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
+
+BATCH_INSTRUCTION = """
+You are a sentiment analyzer. You will be given several news articles, each
+with an id. For every article, classify its overall sentiment and return
+one result per article id: the sentiment label, a score between -1 (very
+negative) and 1 (very positive), and a one-sentence rationale.
+"""
+
+
+class ArticleSentiment(BaseModel):
+  id: str
+  sentiment: Literal['positive', 'negative', 'neutral', 'mixed']
+  score: float
+  rationale: str
+
+
+class BatchSentimentScorer:
+  """Scores many articles with a few packed LLM calls.
+
+  Articles are fetched concurrently; as soon as `articles_per_call` of them
+  are ready they are sent together in one structured-output request, and at
+  most `max_concurrent_calls` such requests run at once. `score` yields one
+  result per article as its pack completes, so callers can stream results
+  back instead of waiting for the whole batch.
+  """
+
+  def __init__(
+      self,
+      model: str = 'gemini-2.0-flash',
+      articles_per_call: int = 8,
+      max_concurrent_calls: int = 4,
+      max_concurrent_fetches: int = 32,
+  ):
+    self.model = model
+    self.articles_per_call = articles_per_call
+    self._calls = asyncio.Semaphore(max_concurrent_calls)
+    self._fetches = asyncio.Semaphore(max_concurrent_fetches)
+    self._client = None
+
+  @property
+  def client(self) -> genai.Client:
+    if self._client is None:
+      self._client = genai.Client()
+    return self._client
+
+  async def _load(self, index: int, item: Any) -> dict[str, str]:
+    """Normalizes an input item to {'id', 'text'} or {'id', 'error'}.
+
+    Never raises: a bad item becomes an error result for its own id, so it
+    can't stop the rest of the batch.
+    """
+    article_id = str(index)
+    try:
+      if isinstance(item, str):
+        is_url = item.startswith(('http://', 'https://'))
+        item = {'url': item} if is_url else {'text': item}
+      if not isinstance(item, dict):
+        return {
+            'id': article_id,
+            'error': 'Article must be a URL, a text, or an object with a url or text.',
+        }
+      article_id = str(item.get('id', index))
+      if item.get('text'):
+        return {'id': article_id, 'text': str(item['text'])}
+      if not item.get('url'):
+        return {'id': article_id, 'error': 'Article needs a url or text.'}
+      async with self._fetches:
+        return {'id': article_id, 'text': await fetcher.fetch(str(item['url']))}
+    except httpx.HTTPError as e:
+      return {'id': article_id, 'error': f'Error fetching article: {e}'}
+    except Exception as e:
+      logger.exception('Could not load article %s', article_id)
+      return {'id': article_id, 'error': f'Could not load article: {e}'}
+
+  async def _score_pack(self, pack: list[dict[str, str]]) -> list[dict]:
+    articles = '\n\n'.join(
+        f'<article id="{a["id"]}">\n{a["text"]}\n</article>' for a in pack
+    )
+    async with self._calls:
+      response = await self.client.aio.models.generate_content(
+          model=self.model,
+          contents=articles,
+          config=types.GenerateContentConfig(
+              system_instruction=BATCH_INSTRUCTION,
+              temperature=0.0,
+              response_mime_type='application/json',
+              response_schema=list[ArticleSentiment],
+          ),
+      )
+    scored = {r.id: r.model_dump() for r in response.parsed or []}
+    return [
+        scored.get(a['id'], {'id': a['id'], 'error': 'No result returned.'})
+        for a in pack
+    ]
+
+  async def score(self, items: list[Any]) -> AsyncIterator[dict]:
+    """Yields a result dict per item, in completion order.
+
+    Items are URLs, raw article texts, or dicts with an optional `id` and a
+    `url` or `text`. Items without an id are numbered by position.
+    """
+    results = asyncio.Queue()
+
+    async def score_pack(pack):
+      try:
+        scored = await self._score_pack(pack)
+      except Exception as e:
+        logger.error('Sentiment batch call failed: %s', e)
+        scored = [{'id': a['id'], 'error': str(e)} for a in pack]
+      for result in scored:
+        await results.put(result)
+
+    async def produce():
+      pack_tasks = []
+      pack = []
+      try:
+        loads = [self._load(i, item) for i, item in enumerate(items)]
+        for loaded in asyncio.as_completed(loads):
+          article = await loaded
+          if 'error' in article:
+            await results.put(article)
+            continue
+          pack.append(article)
+          if len(pack) >= self.articles_per_call:
+            pack_tasks.append(asyncio.create_task(score_pack(pack)))
+            pack = []
+        if pack:
+          pack_tasks.append(asyncio.create_task(score_pack(pack)))
+        await asyncio.gather(*pack_tasks)
+      finally:
+        results.put_nowait(None)
+
+    producer = asyncio.create_task(produce())
+    try:
+      while (result := await results.get()) is not None:
+        yield result
+      # Re-raises a producer failure, so a batch that lost items fails
+      # instead of completing short.
+      await producer
+    finally:
+      producer.cancel()
+
+
+def parse_batch_request(data: Any) -> list[Any] | None:
+  """Returns the articles of a batch request payload, if it is one."""
+  if isinstance(data, str):
+    try:
+      data = json.loads(data)
+    except ValueError:
+      return None
+  if isinstance(data, dict) and isinstance(data.get('articles'), list):
+    return data['articles']
+  return None
@@ -0,0 +1,425 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import collections
+import dataclasses
+import hashlib
+import json
+import logging
+import os
+import queue
+import re
+import sqlite3
+import time
+import zlib
+from contextlib import contextmanager
+from typing import Any, Optional
+
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.models import LlmRequest
+from google.adk.models import LlmResponse
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Set by before_model and read by after_model within the same model call.
+STATE_KEY = 'temp:response_cache'
+VECTOR_DIMENSIONS = 4096
+_WORD = re.compile(r'\w+')
+_WHITESPACE = re.compile(r'\s+')
+
+
+def _strip_volatile(content: dict) -> dict:
+  """Drops the per-call values in a dumped Content that would make identical
+  prompts hash differently: part thought signatures and the ids of function
+  calls and responses. Tool arguments and results are left alone."""
+  for part in content.get('parts', []):
+    part.pop('thought_signature', None)
+    for field in ('function_call', 'function_response'):
+      if field in part:
+        part[field].pop('id', None)
+  return content
+
+
+def _normalize(value: Any) -> Any:
+  if isinstance(value, dict):
+    return {
+        k: _normalize(v) for k, v in sorted(value.items()) if v is not None
+    }
+  if isinstance(value, list):
+    return [_normalize(v) for v in value]
+  if isinstance(value, str):
+    return _WHITESPACE.sub(' ', value).strip()
+  return value
+
+
+def _embed(text: str) -> np.ndarray:
+  """Hashed bag-of-words vector, stable across processes."""
+  vector = np.zeros(VECTOR_DIMENSIONS, dtype=np.float32)
+  for word in _WORD.findall(text.lower()):
+    vector[zlib.crc32(word.encode('utf-8')) % VECTOR_DIMENSIONS] += 1.0
+  norm = np.linalg.norm(vector)
+  return vector / norm if norm else vector
+
+
+def _has_function_call(response: LlmResponse) -> bool:
+  parts = response.content.parts if response.content else None
+  return any(p.function_call for p in parts or [])
+
+
+@dataclasses.dataclass
+class _Entry:
+  response: str
+  bucket: str
+  vector: Optional[np.ndarray]
+  created_at: float
+
+
+class ResponseCache:
+  """Caches LLM responses for ADK agents via model callbacks.
+
+  Attach `before_model` and `after_model` as an agent's
+  before_model_callback and after_model_callback. Requests are keyed by the
+  model, the generate-content config (system instruction and tools
+  included) and the whitespace-normalized conversation, so only agents with
+  a deterministic config (temperature 0) should use it.
+
+  Responses live in a bounded in-memory LRU and, when `path` is set, in a
+  SQLite database that survives restarts; both expire entries after
+  `ttl_seconds`. With `similarity` set, a request that misses the exact key
+  is also matched against earlier requests with the same model, config and
+  turn structure by cosine similarity of hashed bag-of-words vectors.
+  Similar matches only serve text answers, never tool calls, so a cached
+  call can't be replayed with the wrong arguments.
+  """
+
+  def __init__(
+      self,
+      max_entries: int = 1024,
+      ttl_seconds: float = 3600,
+      path: Optional[str] = None,
+      max_disk_entries: int = 100_000,
+      similarity: Optional[float] = None,
+      pool_size: int = 4,
+      enabled: bool = True,
+  ):
+    self.max_entries = max_entries
+    self.ttl_seconds = ttl_seconds
+    self.path = path
+    self.max_disk_entries = max_disk_entries
+    self.similarity = similarity
+    self.enabled = enabled
+    self._entries = collections.OrderedDict()
+    self._stats = collections.Counter()
+    self._connections = queue.Queue()
+    if enabled and path:
+      for _ in range(pool_size):
+        self._connections.put(self._connect())
+      with self._connection() as conn:
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS responses ('
+            ' key TEXT PRIMARY KEY,'
+            ' bucket TEXT NOT NULL,'
+            ' vector BLOB,'
+            ' response TEXT NOT NULL,'
+            ' created_at REAL NOT NULL,'
+            ' accessed_at REAL NOT NULL)'
+        )
+        conn.execute(
+            'CREATE INDEX IF NOT EXISTS responses_bucket'
+            ' ON responses (bucket, created_at)'
+        )
+        conn.execute(
+            'CREATE INDEX IF NOT EXISTS responses_accessed_at'
+            ' ON responses (accessed_at)'
+        )
+
+  @classmethod
+  def from_env(cls) -> 'ResponseCache':
+    backend = os.getenv('RESPONSE_CACHE', 'memory')
+    if backend not in ('memory', 'sqlite', 'off'):
+      raise ValueError(f'Unsupported response cache: {backend}')
+    similarity = os.getenv('RESPONSE_CACHE_SIMILARITY')
+    return cls(
+        max_entries=int(os.getenv('RESPONSE_CACHE_MAX_ENTRIES', 1024)),
+        ttl_seconds=float(os.getenv('RESPONSE_CACHE_TTL_SECONDS', 3600)),
+        path=(
+            os.getenv('RESPONSE_CACHE_PATH', 'responses.db')
+            if backend == 'sqlite'
+            else None
+        ),
+        max_disk_entries=int(
+            os.getenv('RESPONSE_CACHE_DISK_MAX_ENTRIES', 100_000)
+        ),
+        similarity=float(similarity) if similarity else None,
+        enabled=backend != 'off',
+    )
+
+  def _connect(self):
+    conn = sqlite3.connect(
+        self.path, check_same_thread=False, isolation_level=None, timeout=30
+    )
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA synchronous=NORMAL')
+    return conn
+
+  @contextmanager
+  def _connection(self):
+    conn = self._connections.get()
+    try:
+      yield conn
+    finally:
+      self._connections.put(conn)
+
+  def _request_key(self, llm_request: LlmRequest) -> tuple[str, str, str]:
+    """Returns (key, bucket, text) for a request.
+
+    `bucket` groups requests that may be matched by similarity: same model,
+    config and sequence of roles and part types. `text` is what gets
+    embedded for that match.
+    """
+    contents = [
+        _normalize(
+            _strip_volatile(c.model_dump(mode='json', exclude_none=True))
+        )
+        for c in llm_request.contents
+    ]
+    config = (
+        _normalize(
+            llm_request.config.model_dump(
+                mode='json', exclude_none=True, exclude={'http_options'}
+            )
+        )
+        if llm_request.config
+        else {}
+    )
+    shape = [
+        [c.get('role'), [sorted(p) for p in c.get('parts', [])]]
+        for c in contents
+    ]
+    bucket = hashlib.sha256(
+        json.dumps([llm_request.model, config, shape]).encode('utf-8')
+    ).hexdigest()
+    key = hashlib.sha256(
+        json.dumps([bucket, contents]).encode('utf-8')
+    ).hexdigest()
+    # Tool arguments and results are embedded too, so two requests about
+    # different articles don't look alike just because the user's words do.
+    return key, bucket, json.dumps(contents)
+
+  def _get_memory(self, key: str) -> Optional[str]:
+    entry = self._entries.get(key)
+    if entry is None:
+      return None
+    if time.time() - entry.created_at > self.ttl_seconds:
+      del self._entries[key]
+      return None
+    self._entries.move_to_end(key)
+    return entry.response
+
+  def _put_memory(self, key: str, entry: _Entry):
+    self._entries[key] = entry
+    self._entries.move_to_end(key)
+    while len(self._entries) > self.max_entries:
+      self._entries.popitem(last=False)
+      self._stats['evictions'] += 1
+
+  def _similar_memory(self, bucket: str, vector: np.ndarray) -> Optional[str]:
+    cutoff = time.time() - self.ttl_seconds
+    candidates = [
+        (key, entry)
+        for key, entry in self._entries.items()
+        if entry.bucket == bucket
+        and entry.vector is not None
+        and entry.created_at >= cutoff
+    ]
+    if not candidates:
+      return None
+    scores = np.stack([entry.vector for _, entry in candidates]) @ vector
+    best = int(np.argmax(scores))
+    if scores[best] < self.similarity:
+      return None
+    key, entry = candidates[best]
+    self._entries.move_to_end(key)
+    return entry.response
+
+  def _get_disk(self, key: str) -> Optional[_Entry]:
+    now = time.time()
+    with self._connection() as conn:
+      row = conn.execute(
+          'SELECT response, bucket, vector, created_at FROM responses'
+          ' WHERE key = ? AND created_at >= ?',
+          (key, now - self.ttl_seconds),
+      ).fetchone()
+      if row:
+        conn.execute(
+            'UPDATE responses SET accessed_at = ? WHERE key = ?', (now, key)
+        )
+    if not row:
+      return None
+    response, bucket, vector, created_at = row
+    if vector is not None:
+      vector = np.frombuffer(vector, dtype=np.float32)
+    return _Entry(response, bucket, vector, created_at)
+
+  def _similar_disk(
+      self, bucket: str, vector: np.ndarray
+  ) -> Optional[tuple[str, _Entry]]:
+    with self._connection() as conn:
+      rows = conn.execute(
+          'SELECT key, response, vector, created_at FROM responses'
+          ' WHERE bucket = ? AND vector IS NOT NULL AND created_at >= ?'
+          ' ORDER BY created_at DESC LIMIT 1000',
+          (bucket, time.time() - self.ttl_seconds),
+      ).fetchall()
+    if not rows:
+      return None
+    vectors = np.stack([np.frombuffer(r[2], dtype=np.float32) for r in rows])
+    scores = vectors @ vector
+    best = int(np.argmax(scores))
+    if scores[best] < self.similarity:
+      return None
+    key, response, _, created_at = rows[best]
+    return key, _Entry(response, bucket, vectors[best], created_at)
+
+  def _put_disk(self, key: str, entry: _Entry):
+    vector = entry.vector.tobytes() if entry.vector is not None else None
+    with self._connection() as conn:
+      conn.execute(
+          'INSERT INTO responses'
+          ' (key, bucket, vector, response, created_at, accessed_at)'
+          ' VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT(key) DO UPDATE SET'
+          ' response = excluded.response, vector = excluded.vector,'
+          ' created_at = excluded.created_at,'
+          ' accessed_at = excluded.accessed_at',
+          (key, entry.bucket, vector, entry.response, entry.created_at,
+           entry.created_at),
+      )
+    self._stats['disk_writes'] += 1
+    if self._stats['disk_writes'] % 100 == 0:
+      self.compact()
+
+  def compact(self):
+    """Drops expired rows, then least recently used ones over the cap."""
+    with self._connection() as conn:
+      expired = conn.execute(
+          'DELETE FROM responses WHERE created_at < ?',
+          (time.time() - self.ttl_seconds,),
+      ).rowcount
+      evicted = conn.execute(
+          'DELETE FROM responses WHERE key IN (SELECT key FROM responses'
+          ' ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)',
+          (self.max_disk_entries,),
+      ).rowcount
+    self._stats['disk_evictions'] += expired + evicted
+
+  async def _lookup(
+      self, key: str, bucket: str, text: str
+  ) -> tuple[Optional[str], str]:
+    """Returns (response, tier), or (None, '') on a miss."""
+    response = self._get_memory(key)
+    if response is not None:
+      return response, 'memory'
+    if self.path:
+      entry = await asyncio.to_thread(self._get_disk, key)
+      if entry is not None:
+        self._put_memory(key, entry)
+        return entry.response, 'disk'
+    if self.similarity is None:
+      return None, ''
+    vector = _embed(text)
+    response = self._similar_memory(bucket, vector)
+    if response is not None:
+      return response, 'similar'
+    if self.path:
+      match = await asyncio.to_thread(self._similar_disk, bucket, vector)
+      if match is not None:
+        self._put_memory(*match)
+        return match[1].response, 'similar'
+    return None, ''
+
+  async def before_model(
+      self, callback_context: CallbackContext, llm_request: LlmRequest
+  ) -> Optional[LlmResponse]:
+    if not self.enabled:
+      return None
+    try:
+      key, bucket, text = self._request_key(llm_request)
+      response, tier = await self._lookup(key, bucket, text)
+    except (TypeError, ValueError, sqlite3.Error) as e:
+      logger.warning('Response cache lookup failed: %s', e)
+      return None
+    if response is None:
+      self._stats['misses'] += 1
+      callback_context.state[STATE_KEY] = {
+          'key': key,
+          'bucket': bucket,
+          'text': text if self.similarity is not None else '',
+      }
+      return None
+    self._stats[f'{tier}_hits'] += 1
+    callback_context.state[STATE_KEY] = None
+    return LlmResponse.model_validate_json(response)
+
+  async def after_model(
+      self, callback_context: CallbackContext, llm_response: LlmResponse
+  ) -> Optional[LlmResponse]:
+    pending = callback_context.state.get(STATE_KEY)
+    if (
+        not pending
+        or llm_response.partial
+        or llm_response.error_code
+        or not llm_response.content
+        or not llm_response.content.parts
+    ):
+      return None
+    callback_context.state[STATE_KEY] = None
+    # Tool calls are never served by similarity, so they need no vector.
+    vector = None
+    if pending['text'] and not _has_function_call(llm_response):
+      vector = _embed(pending['text'])
+    cached = llm_response.model_copy(deep=True)
+    for part in cached.content.parts:
+      if part.function_call:
+        # Let ADK assign a fresh id when the call is replayed.
+        part.function_call.id = None
+    entry = _Entry(
+        response=cached.model_dump_json(
+            exclude_none=True, exclude={'usage_metadata'}
+        ),
+        bucket=pending['bucket'],
+        vector=vector,
+        created_at=time.time(),
+    )
+    self._put_memory(pending['key'], entry)
+    self._stats['stores'] += 1
+    if self.path:
+      try:
+        await asyncio.to_thread(self._put_disk, pending['key'], entry)
+      except sqlite3.Error as e:
+        logger.warning('Response cache write failed: %s', e)
+    return None
+
+  def metrics(self) -> dict[str, float]:
+    hits = sum(self._stats[f'{t}_hits'] for t in ('memory', 'disk', 'similar'))
+    lookups = hits + self._stats['misses']
+    return {
+        **self._stats,
+        'entries': len(self._entries),
+        'hit_rate': hits / lookups if lookups else 0.0,
+    }
+
+
+response_cache = ResponseCache.from_env()
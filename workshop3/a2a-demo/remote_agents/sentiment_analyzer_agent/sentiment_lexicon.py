@@ -0,0 +1,146 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import collections
+import dataclasses
+import json
+import os
+import re
+import time
+
+import numpy as np
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+LEXICON_PATH = os.path.join(DATA_DIR, 'sentiment_lexicon.tsv')
+LABELLED_PATH = os.path.join(DATA_DIR, 'labelled_news.jsonl')
+
+NEGATORS = frozenset({
+    'not', 'no', 'never', 'without', "n't", 'hardly', 'barely', 'neither',
+    'nor', 'cannot',
+})
+# Words within this many tokens after a negator have their polarity flipped.
+NEGATION_WINDOW = 3
+# A trailing n't is split off so it counts as a negator (weren't -> were n't).
+_TOKEN = re.compile(r"[a-z]+(?=n't)|n't|[a-z][a-z'-]*")
+
+
+@dataclasses.dataclass
+class LexiconResult:
+  label: str
+  confidence: float
+  polarity: float
+
+
+class LexiconSentimentScorer:
+  """CPU-only sentiment pre-classifier based on a weighted lexicon.
+
+  Each token is looked up in the lexicon, with polarity flipped after a
+  nearby negator. Positive and negative evidence is summed and turned into
+  a polarity in [-1, 1] and a confidence that grows with both the margin and
+  the amount of evidence. Only clearly polar texts clear `threshold`; the
+  rest should be left to the LLM.
+  """
+
+  def __init__(
+      self,
+      lexicon_path: str = LEXICON_PATH,
+      threshold: float = 0.6,
+      smoothing: float = 2.0,
+  ):
+    self.threshold = threshold
+    self.smoothing = smoothing
+    words, weights = [], []
+    with open(lexicon_path, encoding='utf-8') as f:
+      for line in f:
+        if line.startswith('#') or not line.strip():
+          continue
+        word, weight = line.split('\t')
+        words.append(word)
+        weights.append(float(weight))
+    self._index = {word: i for i, word in enumerate(words)}
+    self._weights = np.asarray(weights)
+    self._stats = collections.Counter()
+    self._fast_path_seconds = 0.0
+
+  def score(self, text: str) -> LexiconResult:
+    tokens = _TOKEN.findall(text.lower().replace('’', "'"))
+    if not tokens:
+      return LexiconResult('neutral', 0.0, 0.0)
+    n = len(tokens)
+    ids = np.fromiter((self._index.get(t, -1) for t in tokens), int, n)
+    negator = np.fromiter((t in NEGATORS for t in tokens), int, n)
+    # negated[i] is set when a negator appears in the preceding window.
+    window = np.convolve(negator, np.ones(NEGATION_WINDOW, int))[:n]
+    negated = np.concatenate(([0], window[:-1])) > 0
+    hits = ids >= 0
+    weights = self._weights[ids[hits]] * np.where(negated[hits], -1.0, 1.0)
+    positive = weights[weights > 0].sum()
+    negative = -weights[weights < 0].sum()
+    total = positive + negative
+    if total == 0:
+      return LexiconResult('neutral', 0.0, 0.0)
+    polarity = (positive - negative) / total
+    confidence = abs(positive - negative) / (total + self.smoothing)
+    if polarity > 0:
+      label = 'positive'
+    elif polarity < 0:
+      label = 'negative'
+    else:
+      label = 'neutral'
+    return LexiconResult(label, float(confidence), float(polarity))
+
+  def classify(self, text: str) -> LexiconResult | None:
+    """Returns the result when confident enough, otherwise None."""
+    start = time.perf_counter()
+    result = self.score(text)
+    self._fast_path_seconds += time.perf_counter() - start
+    if result.label != 'neutral' and result.confidence >= self.threshold:
+      self._stats['fast_path'] += 1
+      return result
+    self._stats['llm_fallback'] += 1
+    return None
+
+  def metrics(self) -> dict[str, float]:
+    calls = max(1, self._stats['fast_path'] + self._stats['llm_fallback'])
+    return {
+        **self._stats,
+        'fast_path_rate': self._stats['fast_path'] / calls,
+        'avg_classify_ms': 1000 * self._fast_path_seconds / calls,
+    }
+
+
+def evaluate(scorer: LexiconSentimentScorer, path: str = LABELLED_PATH):
+  """Prints coverage, accuracy and latency per threshold on a labelled set."""
+  with open(path, encoding='utf-8') as f:
+    examples = [json.loads(line) for line in f if line.strip()]
+  start = time.perf_counter()
+  results = [scorer.score(e['text']) for e in examples]
+  per_text_ms = 1000 * (time.perf_counter() - start) / len(examples)
+  print(f'{len(examples)} examples, {per_text_ms:.3f} ms per text')
+  print('threshold  coverage  accuracy')
+  for threshold in np.arange(0.3, 0.95, 0.05):
+    answered = [
+        (r.label, e['label'])
+        for r, e in zip(results, examples)
+        if r.label != 'neutral' and r.confidence >= threshold
+    ]
+    coverage = len(answered) / len(examples)
+    accuracy = (
+        sum(p == l for p, l in answered) / len(answered) if answered else 0.0
+    )
+    print(f'{threshold:9.2f}  {coverage:8.0%}  {accuracy:8.0%}')
+
+
+if __name__ == '__main__':
+  evaluate(LexiconSentimentScorer())
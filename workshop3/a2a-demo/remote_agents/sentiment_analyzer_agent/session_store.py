@@ -0,0 +1,110 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import collections
+import logging
+import time
+from typing import Any, Optional
+
+from google.adk.events import Event
+from google.adk.sessions import InMemorySessionService
+from google.adk.sessions import Session
+
+logger = logging.getLogger(__name__)
+
+
+class BoundedInMemorySessionService(InMemorySessionService):
+  """In-memory session service with LRU and idle-time eviction.
+
+  Sessions are tracked in access order. Sessions idle for longer than
+  `idle_ttl` seconds are dropped, and once more than `max_sessions` are live
+  the least recently used ones are dropped as well. Eviction runs whenever a
+  session is created, so memory stays bounded on long-lived instances.
+  """
+
+  def __init__(self, max_sessions: int = 10000, idle_ttl: float = 3600):
+    super().__init__()
+    self.max_sessions = max_sessions
+    self.idle_ttl = idle_ttl
+    self._last_access = collections.OrderedDict()
+    self._evicted_lru = 0
+    self._evicted_idle = 0
+
+  def _touch(self, app_name: str, user_id: str, session_id: str):
+    key = (app_name, user_id, session_id)
+    self._last_access[key] = time.monotonic()
+    self._last_access.move_to_end(key)
+
+  async def _evict(self):
+    now = time.monotonic()
+    while self._last_access:
+      key, last_access = next(iter(self._last_access.items()))
+      if now - last_access > self.idle_ttl:
+        self._evicted_idle += 1
+      elif len(self._last_access) > self.max_sessions:
+        self._evicted_lru += 1
+      else:
+        break
+      app_name, user_id, session_id = key
+      logger.debug('Evicting session %s for user %s', session_id, user_id)
+      await self.delete_session(
+          app_name=app_name, user_id=user_id, session_id=session_id
+      )
+
+  async def create_session(
+      self,
+      *,
+      app_name: str,
+      user_id: str,
+      state: Optional[dict[str, Any]] = None,
+      session_id: Optional[str] = None,
+  ) -> Session:
+    session = await super().create_session(
+        app_name=app_name, user_id=user_id, state=state, session_id=session_id
+    )
+    self._touch(app_name, user_id, session.id)
+    await self._evict()
+    return session
+
+  async def get_session(
+      self, *, app_name: str, user_id: str, session_id: str, **kwargs
+  ) -> Optional[Session]:
+    session = await super().get_session(
+        app_name=app_name, user_id=user_id, session_id=session_id, **kwargs
+    )
+    if session is not None:
+      self._touch(app_name, user_id, session_id)
+    return session
+
+  async def append_event(self, session: Session, event: Event) -> Event:
+    event = await super().append_event(session, event)
+    if (session.app_name, session.user_id, session.id) in self._last_access:
+      self._touch(session.app_name, session.user_id, session.id)
+    return event
+
+  async def delete_session(
+      self, *, app_name: str, user_id: str, session_id: str
+  ) -> None:
+    await super().delete_session(
+        app_name=app_name, user_id=user_id, session_id=session_id
+    )
+    self._last_access.pop((app_name, user_id, session_id), None)
+
+  def metrics(self) -> dict[str, int]:
+    """Returns counters describing the current state of the store."""
+    return {
+        'live_sessions': len(self._last_access),
+        'evicted_lru': self._evicted_lru,
+        'evicted_idle': self._evicted_idle,
+    }
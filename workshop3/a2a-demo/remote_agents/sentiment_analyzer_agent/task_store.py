@@ -0,0 +1,162 @@
+"""
+Copyright 2025 Google LLC
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    https://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import asyncio
+import logging
+import os
+import queue
+import sqlite3
+import time
+from contextlib import contextmanager
+
+from a2a.server.context import ServerCallContext
+from a2a.server.tasks import InMemoryTaskStore, TaskStore
+from a2a.types import Task
+
+logger = logging.getLogger(__name__)
+
+
+class SQLiteTaskStore(TaskStore):
+    """A2A task store backed by a local SQLite database.
+
+    Tasks are stored as JSON keyed by task id, so lookups are a single
+    primary-key read and memory use does not grow with the number of tasks.
+    The database runs in WAL mode so `tasks/get` polling is not blocked by
+    concurrent writes. Tasks not updated for `ttl_seconds` are deleted by a
+    compaction pass that runs at most every `compact_interval` seconds.
+
+    On Cloud Run the database only outlives an instance when `path` is on a
+    mounted volume.
+    """
+
+    def __init__(
+        self, path, ttl_seconds=86400, pool_size=4, compact_interval=300
+    ):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.compact_interval = compact_interval
+        self._last_compaction = time.monotonic()
+        # Kept so the running compaction is not garbage-collected.
+        self._compact_task = None
+        self._connections = queue.Queue()
+        for _ in range(pool_size):
+            self._connections.put(self._connect())
+        with self._connection() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS tasks ("
+                " id TEXT PRIMARY KEY,"
+                " data TEXT NOT NULL,"
+                " updated_at REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS tasks_updated_at ON tasks (updated_at)"
+            )
+
+    def _connect(self):
+        conn = sqlite3.connect(
+            self.path, check_same_thread=False, isolation_level=None, timeout=30
+        )
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA busy_timeout=30000")
+        return conn
+
+    @contextmanager
+    def _connection(self):
+        conn = self._connections.get()
+        try:
+            yield conn
+        finally:
+            self._connections.put(conn)
+
+    def _save(self, task_id, data):
+        with self._connection() as conn:
+            conn.execute(
+                "INSERT INTO tasks (id, data, updated_at) VALUES (?, ?, ?)"
+                " ON CONFLICT(id) DO UPDATE SET"
+                " data = excluded.data, updated_at = excluded.updated_at",
+                (task_id, data, time.time()),
+            )
+
+    def _get(self, task_id):
+        with self._connection() as conn:
+            row = conn.execute(
+                "SELECT data FROM tasks WHERE id = ?", (task_id,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def _delete(self, task_id):
+        with self._connection() as conn:
+            conn.execute("DELETE FROM tasks WHERE id = ?", (task_id,))
+
+    def compact(self):
+        """Deletes tasks that have not been updated within the TTL."""
+        cutoff = time.time() - self.ttl_seconds
+        with self._connection() as conn:
+            deleted = conn.execute(
+                "DELETE FROM tasks WHERE updated_at < ?", (cutoff,)
+            ).rowcount
+        if deleted:
+            logger.info(f"Compacted {deleted} expired tasks from {self.path}")
+
+    async def _compact(self):
+        try:
+            await asyncio.to_thread(self.compact)
+        except Exception:
+            logger.exception("Task store compaction failed")
+        finally:
+            self._last_compaction = time.monotonic()
+
+    async def save(
+        self, task: Task, context: ServerCallContext | None = None
+    ) -> None:
+        await asyncio.to_thread(self._save, task.id, task.model_dump_json())
+        if (
+            self._compact_task is None or self._compact_task.done()
+        ) and time.monotonic() - self._last_compaction >= self.compact_interval:
+            self._compact_task = asyncio.create_task(self._compact())
+
+    async def get(
+        self, task_id: str, context: ServerCallContext | None = None
+    ) -> Task | None:
+        data = await asyncio.to_thread(self._get, task_id)
+        return Task.model_validate_json(data) if data else None
+
+    async def delete(
+        self, task_id: str, context: ServerCallContext | None = None
+    ) -> None:
+        await asyncio.to_thread(self._delete, task_id)
+
+
+def build_task_store() -> TaskStore:
+    """Creates the task store selected by the A2A_TASK_STORE env var.
+
+    Supported values are "memory" (default) and "sqlite". The SQLite store
+    is configured with A2A_TASK_STORE_PATH, A2A_TASK_STORE_TTL_SECONDS and
+    A2A_TASK_STORE_POOL_SIZE.
+    """
+    backend = os.getenv("A2A_TASK_STORE", "memory")
+    if backend == "memory":
+        return InMemoryTaskStore()
+    if backend == "sqlite":
+        path = os.getenv("A2A_TASK_STORE_PATH", "tasks.db")
+        logger.info(f"Using SQLite task store at {path}")
+        return SQLiteTaskStore(
+            path,
+            ttl_seconds=float(os.getenv("A2A_TASK_STORE_TTL_SECONDS", 86400)),
+            pool_size=int(os.getenv("A2A_TASK_STORE_POOL_SIZE", 4)),
+        )
+    raise ValueError(f"Unsupported task store: {backend}")
@@ -0,0 +1,73 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import importlib.util
+import pathlib
+
+import pytest
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+# The orchestrator and the sentiment agent each ship their own copy.
+COPIES = {
+    'orchestrator': ROOT / 'orchestrator' / 'agent' / 'article_extract.py',
+    'sentiment': (
+        ROOT / 'remote_agents' / 'sentiment_analyzer_agent' / 'article_extract.py'
+    ),
+}
+
+ARTICLE = (
+    'Chip makers rallied on Tuesday after the announcement of a new design.',
+    'Analysts expect the change to lift margins across the whole industry.',
+    'Shares of the largest suppliers closed at record highs in late trading.',
+)
+
+
+def _load(name):
+  spec = importlib.util.spec_from_file_location(
+      f'article_extract_{name}', COPIES[name]
+  )
+  module = importlib.util.module_from_spec(spec)
+  spec.loader.exec_module(module)
+  return module
+
+
+@pytest.fixture(params=sorted(COPIES))
+def extract_text(request):
+  return _load(request.param).extract_text
+
+
+def test_unclosed_tags_in_skipped_subtree(extract_text):
+  page = (
+      '<html><head><title>Chip makers rally</title></head><body>'
+      '<nav><ul><li>Home<li>World<li>Business</ul></nav>'
+      f'<p>{ARTICLE[0]}<p>{ARTICLE[1]}'
+      '<footer><p>About us<p>Contact</footer>'
+      f'<p>{ARTICLE[2]}'
+      '</body></html>'
+  )
+
+  text = extract_text(page, 4000).text
+
+  assert text.splitlines() == ['Chip makers rally', *ARTICLE]
+
+
+def test_nested_skipped_tags(extract_text):
+  page = (
+      '<body><div class="sidebar"><div><div>Popular</div></div>'
+      f'<p>Most read</div><p>{ARTICLE[0]}</p><p>{ARTICLE[1]}</p></body>'
+  )
+
+  text = extract_text(page, 4000).text
+
+  assert text.splitlines() == list(ARTICLE[:2])
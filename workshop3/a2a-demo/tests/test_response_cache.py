@@ -0,0 +1,95 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import importlib.util
+import pathlib
+
+import pytest
+
+pytest.importorskip('google.adk')
+
+from google.adk.models import LlmRequest
+from google.genai import types
+
+PATH = (
+    pathlib.Path(__file__).resolve().parent.parent
+    / 'remote_agents' / 'sentiment_analyzer_agent' / 'response_cache.py'
+)
+
+
+@pytest.fixture(scope='module')
+def cache():
+  spec = importlib.util.spec_from_file_location('response_cache', PATH)
+  module = importlib.util.module_from_spec(spec)
+  spec.loader.exec_module(module)
+  return module.ResponseCache()
+
+
+def _request(call_id, args, response):
+  return LlmRequest(
+      model='gemini-2.0-flash',
+      contents=[
+          types.Content(
+              role='user',
+              parts=[types.Part(text='Analyze the sentiment of this article.')],
+          ),
+          types.Content(
+              role='model',
+              parts=[
+                  types.Part(
+                      function_call=types.FunctionCall(
+                          id=call_id, name='get_article', args=args
+                      )
+                  )
+              ],
+          ),
+          types.Content(
+              role='user',
+              parts=[
+                  types.Part(
+                      function_response=types.FunctionResponse(
+                          id=call_id, name='get_article', response=response
+                      )
+                  )
+              ],
+          ),
+      ],
+  )
+
+
+def test_call_ids_do_not_change_the_key(cache):
+  first = cache._request_key(
+      _request('adk-1', {'id': 'a1'}, {'id': 'a1', 'text': 'Up.'})
+  )
+  second = cache._request_key(
+      _request('adk-2', {'id': 'a1'}, {'id': 'a1', 'text': 'Up.'})
+  )
+
+  assert first[0] == second[0]
+
+
+@pytest.mark.parametrize(
+    'args, response',
+    [
+        ({'id': 'a2'}, {'id': 'a1', 'text': 'Up.'}),
+        ({'id': 'a1'}, {'id': 'a2', 'text': 'Up.'}),
+    ],
+)
+def test_tool_fields_named_id_change_the_key(cache, args, response):
+  first = cache._request_key(
+      _request('adk-1', {'id': 'a1'}, {'id': 'a1', 'text': 'Up.'})
+  )
+  second = cache._request_key(_request('adk-1', args, response))
+
+  assert first[0] != second[0]
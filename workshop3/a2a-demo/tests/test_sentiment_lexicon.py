@@ -0,0 +1,64 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import importlib.util
+import json
+import pathlib
+
+import pytest
+
+PATH = (
+    pathlib.Path(__file__).resolve().parent.parent
+    / 'remote_agents' / 'sentiment_analyzer_agent' / 'sentiment_lexicon.py'
+)
+
+
+@pytest.fixture(scope='module')
+def lexicon():
+  spec = importlib.util.spec_from_file_location('sentiment_lexicon', PATH)
+  module = importlib.util.module_from_spec(spec)
+  spec.loader.exec_module(module)
+  return module
+
+
+@pytest.fixture(scope='module')
+def scorer(lexicon):
+  return lexicon.LexiconSentimentScorer()
+
+
+@pytest.mark.parametrize(
+    'text, label',
+    [
+        ("The results weren't good and didn't impress investors.", 'negative'),
+        ("Regulators didn't approve the merger.", 'negative'),
+        ("The company hasn't reported any losses this year.", 'positive'),
+        ("Exports haven't declined despite the new tariffs.", 'positive'),
+    ],
+)
+def test_contracted_negation(scorer, text, label):
+  assert scorer.score(text).label == label
+
+
+def test_labelled_set_agrees_above_threshold(lexicon, scorer):
+  with open(lexicon.LABELLED_PATH, encoding='utf-8') as f:
+    examples = [json.loads(line) for line in f if line.strip()]
+
+  answered = [
+      (result.label, e['label'], e['text'])
+      for e in examples
+      if (result := scorer.classify(e['text'])) is not None
+  ]
+
+  assert answered
+  assert [a for a in answered if a[0] != a[1]] == []
@@ -1,9 +1,10 @@
 # news_gcs_agent/main.py
 import os
-import uvicorn
 from fastapi import FastAPI
 from google.adk.cli.fast_api import get_fast_api_app
 
+from serve import serve
+
 # The directory containing this main.py file
 AGENTS_DIR = os.path.dirname(os.path.abspath(__file__))
 
@@ -13,5 +14,6 @@ app: FastAPI = get_fast_api_app(
 )
 
 if __name__ == "__main__":
-    port = int(os.environ.get("PORT", 8080))
-    uvicorn.run(app, host="0.0.0.0", port=port)
\ No newline at end of file
+    # Prefer `python serve.py`: this process has already built the app, and
+    # with more than one worker each worker builds its own.
+    serve("main:app")
\ No newline at end of file